@@ -1,6 +1,199 @@
+import os
 import json
+import time
+import random
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
+import openai
 from openai import OpenAI as openai_client
 
+API_URL = "https://api.siliconflow.cn/v1"
+
+class _ClientPool:
+    """
+    进程级OpenAI客户端池，按 (api_key, base_url) 复用客户端及其HTTP keep-alive连接，
+    避免每次执行都重新创建客户端并重新建立TCP/TLS连接
+
+    - 最多保留 max_clients 个客户端（JT_LLM_POOL_SIZE，默认8），超出时关闭最久未使用的
+    - 空闲超过 idle_seconds 秒（JT_LLM_POOL_IDLE，默认300）的客户端被关闭
+    - 请求超时 timeout 秒（JT_LLM_TIMEOUT，默认600），连接超时 connect_timeout 秒（JT_LLM_CONNECT_TIMEOUT，默认10）
+    - 正在使用的客户端不会被关闭
+    """
+
+    max_clients = int(os.environ.get("JT_LLM_POOL_SIZE", "8"))
+    idle_seconds = float(os.environ.get("JT_LLM_POOL_IDLE", "300"))
+    timeout = float(os.environ.get("JT_LLM_TIMEOUT", "600"))
+    connect_timeout = float(os.environ.get("JT_LLM_CONNECT_TIMEOUT", "10"))
+
+    _clients = OrderedDict()  # (api_key, base_url) -> [客户端, 最后使用时间, 使用中的数量]
+    _lock = threading.Lock()
+
+    @classmethod
+    def _evict(cls, now):
+        """移出空闲超时和超出数量的客户端（调用方持有_lock），返回需要关闭的客户端"""
+        stale = []
+        for key, (client, last_used, in_use) in list(cls._clients.items()):
+            if not in_use and (now - last_used > cls.idle_seconds or len(cls._clients) > cls.max_clients):
+                del cls._clients[key]
+                stale.append(client)
+        return stale
+
+    @classmethod
+    @contextmanager
+    def client(cls, api_key, base_url=API_URL):
+        """取用 (api_key, base_url) 对应的客户端，不存在时创建"""
+        key = (api_key, base_url)
+        with cls._lock:
+            entry = cls._clients.pop(key, None)
+            if entry is None:
+                entry = [openai_client(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=openai.Timeout(cls.timeout, connect=cls.connect_timeout)
+                ), 0.0, 0]
+            entry[2] += 1
+            cls._clients[key] = entry
+            stale = cls._evict(time.monotonic())
+        for stale_client in stale:
+            stale_client.close()
+        try:
+            yield entry[0]
+        finally:
+            with cls._lock:
+                entry[1] = time.monotonic()
+                entry[2] -= 1
+
+    @classmethod
+    def configure(cls, max_clients=None, idle_seconds=None, timeout=None, connect_timeout=None):
+        """修改池的配置；超时设置对之后新建的客户端生效，因此会关闭当前空闲的客户端"""
+        with cls._lock:
+            if max_clients is not None:
+                cls.max_clients = max_clients
+            if idle_seconds is not None:
+                cls.idle_seconds = idle_seconds
+            if timeout is not None or connect_timeout is not None:
+                cls.timeout = timeout if timeout is not None else cls.timeout
+                cls.connect_timeout = connect_timeout if connect_timeout is not None else cls.connect_timeout
+                idle = [key for key, entry in cls._clients.items() if not entry[2]]
+                stale = [cls._clients.pop(key)[0] for key in idle]
+            else:
+                stale = cls._evict(time.monotonic())
+        for stale_client in stale:
+            stale_client.close()
+
+def configure_client_pool(max_clients=None, idle_seconds=None, timeout=None, connect_timeout=None):
+    """
+    配置Siliconflow节点共用的客户端池
+
+    Args:
+        max_clients: 最多保留的客户端数量
+        idle_seconds: 客户端空闲多少秒后关闭
+        timeout: 请求超时（秒）
+        connect_timeout: 连接超时（秒）
+    """
+    _ClientPool.configure(max_clients, idle_seconds, timeout, connect_timeout)
+
+class _ResponseCache:
+    """
+    Siliconflow响应的磁盘缓存（SQLite），按 (model, messages, max_tokens, seed) 的哈希保存
+
+    - 默认保存在本目录的 .jt_llm_cache.sqlite（JT_LLM_CACHE_PATH 可修改）
+    - 超过有效期的响应视为未命中；条目数超过 max_entries（JT_LLM_CACHE_MAX_ENTRIES，默认10000）时
+      删除最久未使用的条目
+    - 以 "Error:" 开头的响应不会被缓存
+    - 读写失败时抛出 sqlite3.Error，调用方忽略缓存直接请求
+    """
+
+    path = os.environ.get("JT_LLM_CACHE_PATH",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), ".jt_llm_cache.sqlite"))
+    max_entries = int(os.environ.get("JT_LLM_CACHE_MAX_ENTRIES", "10000"))
+
+    @staticmethod
+    def make_key(model, messages, max_tokens, seed):
+        payload = json.dumps([model, messages, max_tokens, seed], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _connect(cls):
+        conn = sqlite3.connect(cls.path, timeout=30, isolation_level=None)
+        try:
+            # 每次连接都确认表结构存在，缓存文件被删除后也能继续使用
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+            """)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    @classmethod
+    def get(cls, key, ttl_seconds):
+        """读取未过期的响应，ttl_seconds为0时永不过期；未命中时返回None"""
+        conn = cls._connect()
+        try:
+            row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if ttl_seconds and now - row[1] > ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+        finally:
+            conn.close()
+
+    @classmethod
+    def put(cls, key, response):
+        """保存响应，超过条目上限时删除最久未使用的条目"""
+        if response is None or response.startswith("Error:"):
+            return
+        conn = cls._connect()
+        try:
+            now = time.time()
+            conn.execute("INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                         (key, response, now, now))
+            excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - cls.max_entries
+            if excess > 0:
+                conn.execute("DELETE FROM responses WHERE key IN "
+                             "(SELECT key FROM responses ORDER BY accessed LIMIT ?)", (excess,))
+        finally:
+            conn.close()
+
+def create_completion(client, model, messages, max_tokens, **options):
+    """
+    发送聊天请求，失败时抛出异常
+
+    Args:
+        client: OpenAI客户端实例
+        model: 模型名称
+        messages: 消息历史列表
+        max_tokens: 最大生成token数
+        **options: 客户端选项（例如 max_retries）
+
+    Returns:
+        str: 模型的响应内容
+    """
+    if options:
+        client = client.with_options(**options)
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content
+
 def chat(client, model, messages, max_tokens):
     """
     使用OpenAI客户端发送聊天请求
@@ -15,15 +208,79 @@ def chat(client, model, messages, max_tokens):
         str: 模型的响应内容
     """
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            max_tokens=max_tokens
-        )
-        return response.choices[0].message.content
+        return create_completion(client, model, messages, max_tokens)
     except Exception as e:
         return f"Error: {str(e)}"
 
+class _RateLimiter:
+    """
+    批量请求共用的429退避状态：任一请求收到429后，所有线程都等待到冷却结束再发送
+
+    等待时间优先使用响应的 Retry-After，否则按指数退避（base_delay * 2^n，加随机抖动，最长max_delay）
+    """
+
+    def __init__(self, base_delay=1.0, max_delay=60.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.not_before = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """等待到冷却结束"""
+        while True:
+            with self.lock:
+                delay = self.not_before - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def delay(self, error, attempt):
+        """第attempt次重试前的等待秒数"""
+        delay = None
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = None
+        if delay is None:
+            delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * (0.5 + random.random() / 2)
+        return delay
+
+    def backoff(self, error, attempt):
+        """记录一次429，所有线程等待到冷却结束，返回本次等待的秒数"""
+        delay = self.delay(error, attempt)
+        with self.lock:
+            self.not_before = max(self.not_before, time.monotonic() + delay)
+        return delay
+
+def chat_with_backoff(client, model, messages, max_tokens, limiter, max_retries):
+    """
+    发送聊天请求，出错时按Retry-After或指数退避重试，最多max_retries次
+
+    - 429：所有线程共同等待冷却结束
+    - 连接错误、超时、5xx：只有当前请求等待后重试（与客户端自带的重试相同的错误类型）
+    - 其他错误或重试次数用完时返回 "Error: ..."（与chat一致）
+    """
+    attempt = 0
+    while True:
+        limiter.wait()
+        try:
+            return create_completion(client, model, messages, max_tokens, max_retries=0)
+        except openai.RateLimitError as e:
+            if attempt >= max_retries:
+                return f"Error: {str(e)}"
+            limiter.backoff(e, attempt)
+            attempt += 1
+        except (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError) as e:
+            if attempt >= max_retries:
+                return f"Error: {str(e)}"
+            time.sleep(limiter.delay(e, attempt))
+            attempt += 1
+        except Exception as e:
+            return f"Error: {str(e)}"
+
 class SiliconflowFreeNode:
     def __init__(self):
         self.session_history = []  # 用于存储会话历史的列表
@@ -59,6 +316,8 @@ class SiliconflowFreeNode:
             },
                "optional":{
                     "custom_model_name":("STRING", {"forceInput": True,}), #适合自定义model
+                    "cache_mode":(["off", "use", "refresh"], {"default": "off"}), #响应缓存：关闭/使用/忽略已有缓存并重新请求
+                    "cache_ttl_hours":("FLOAT", {"default": 168.0, "min": 0.0, "max": 87600.0, "step": 1.0}), #缓存有效期，0为永不过期
                 },
         }
 
@@ -77,20 +336,15 @@ class SiliconflowFreeNode:
                                 seed,
                                 context_size,
                                 max_tokens,
-                                custom_model_name=None):
+                                custom_model_name=None,
+                                cache_mode="off",
+                                cache_ttl_hours=168.0):
 
         if custom_model_name!=None:
             model=custom_model_name
 
-        api_url="https://api.siliconflow.cn/v1"
-        
         if system_content:
             self.system_content=system_content
-        
-        client = openai_client(
-            api_key=api_key,
-            base_url=api_url
-        )
 
         def crop_list_tail(lst, size):
             if size >= len(lst):
@@ -104,8 +358,138 @@ class SiliconflowFreeNode:
 
         messages=[{"role": "system", "content": self.system_content}]+session_history+[{"role": "user", "content": prompt}]
 
-        response_content = chat(client,model,messages,max_tokens)
+        # 响应缓存：相同的模型、消息、最大长度和seed直接返回已保存的响应
+        response_content = None
+        if cache_mode != "off":
+            cache_key = _ResponseCache.make_key(model, messages, max_tokens, seed)
+            if cache_mode == "use":
+                try:
+                    response_content = _ResponseCache.get(cache_key, cache_ttl_hours * 3600)
+                except sqlite3.Error as e:  # 缓存损坏、被锁定或只读时直接请求
+                    print(f"[JTnodes] 读取LLM响应缓存失败: {e}")
+
+        if response_content is None:
+            # 复用客户端池中的客户端（保持HTTP keep-alive连接）
+            with _ClientPool.client(api_key, API_URL) as client:
+                response_content = chat(client,model,messages,max_tokens)
+            if cache_mode != "off":
+                try:
+                    _ResponseCache.put(cache_key, response_content)
+                except sqlite3.Error as e:
+                    print(f"[JTnodes] 写入LLM响应缓存失败: {e}")
         
         self.session_history=self.session_history+[{"role": "user", "content": prompt}]+[{'role':'assistant',"content":response_content}]
 
         return (response_content,json.dumps(messages, indent=4),json.dumps(self.session_history, indent=4),)
+
+class SiliconflowBatchNode:
+    """
+    Siliconflow批量对话节点：将一组提示词并发发送，结果按输入顺序输出
+
+    - 每个提示词独立请求（系统设定 + 提示词），不使用会话历史
+    - concurrency 限制同时进行的请求数
+    - 收到429时所有请求暂停，按 Retry-After 或指数退避后重试，最多 max_retries 次
+    - 连接错误、超时和5xx错误只重试出错的请求，同样最多 max_retries 次
+    - 单个请求失败时该位置输出 "Error: ..."，不影响其他结果
+    - 支持与对话节点相同的响应缓存
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        model_list= [ 
+            "Pro/deepseek-ai/DeepSeek-V3",
+            "Qwen/QwQ-32B",
+            "Qwen/Qwen2.5-32B-Instruct",
+            "Pro/deepseek-ai/DeepSeek-R1"
+            ]
+        return {
+            "required": {
+                "api_key": ("STRING", {
+                    "multiline": False,
+                    "default": "your-api-key-here",
+                    "dynamicPrompts": False,
+                    "displayedLength": 100
+                }),
+                "prompts": ("STRING", {"multiline": True,"dynamicPrompts": False}),
+                "system_content": ("STRING", 
+                                   {
+                                       "default": "You are ChatGPT, a large language model trained by OpenAI. Answer as concisely as possible.", 
+                                       "multiline": True,"dynamicPrompts": False
+                                       }),
+                "model": ( model_list, 
+                    {"default": model_list[0]}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff, "step": 1}),
+                "max_tokens":("INT", {"default": 2048, "min": 512, "max":200000, "step": 1}),
+                "concurrency":("INT", {"default": 4, "min": 1, "max": 64, "step": 1}),
+            },
+               "optional":{
+                    "custom_model_name":("STRING", {"forceInput": True,}), #适合自定义model
+                    "split_lines":("BOOLEAN", {"default": True}), #单个多行文本时每行作为一个提示词
+                    "max_retries":("INT", {"default": 5, "min": 0, "max": 20, "step": 1}), #429、5xx与连接错误的重试次数
+                    "cache_mode":(["off", "use", "refresh"], {"default": "off"}),
+                    "cache_ttl_hours":("FLOAT", {"default": 168.0, "min": 0.0, "max": 87600.0, "step": 1.0}),
+                },
+        }
+
+    RETURN_TYPES = ("STRING","STRING",)
+    RETURN_NAMES = ("text","texts_json",)
+    FUNCTION = "generate_batch"
+    CATEGORY = "JT/text"
+    INPUT_IS_LIST = True
+    OUTPUT_IS_LIST = (True,False,)
+
+    def generate_batch(self,
+                       api_key,
+                       prompts,
+                       system_content,
+                       model,
+                       seed,
+                       max_tokens,
+                       concurrency,
+                       custom_model_name=None,
+                       split_lines=None,
+                       max_retries=None,
+                       cache_mode=None,
+                       cache_ttl_hours=None):
+
+        # INPUT_IS_LIST模式下，除提示词外的参数取第一个值
+        api_key, system_content, model = api_key[0], system_content[0], model[0]
+        seed, max_tokens, concurrency = seed[0], max_tokens[0], concurrency[0]
+        if custom_model_name:
+            model = custom_model_name[0]
+        split_lines = split_lines[0] if split_lines else True
+        max_retries = max_retries[0] if max_retries else 5
+        cache_mode = cache_mode[0] if cache_mode else "off"
+        cache_ttl_hours = cache_ttl_hours[0] if cache_ttl_hours else 168.0
+
+        if len(prompts) == 1 and split_lines:
+            prompts = [line for line in prompts[0].splitlines() if line.strip()]
+
+        limiter = _RateLimiter()
+
+        def run(prompt):
+            messages = [{"role": "system", "content": system_content}, {"role": "user", "content": prompt}]
+            if cache_mode != "off":
+                cache_key = _ResponseCache.make_key(model, messages, max_tokens, seed)
+                if cache_mode == "use":
+                    try:
+                        cached = _ResponseCache.get(cache_key, cache_ttl_hours * 3600)
+                    except sqlite3.Error as e:  # 缓存损坏、被锁定或只读时直接请求
+                        print(f"[JTnodes] 读取LLM响应缓存失败: {e}")
+                        cached = None
+                    if cached is not None:
+                        return cached
+            response_content = chat_with_backoff(client, model, messages, max_tokens, limiter, max_retries)
+            if cache_mode != "off":
+                try:
+                    _ResponseCache.put(cache_key, response_content)
+                except sqlite3.Error as e:
+                    print(f"[JTnodes] 写入LLM响应缓存失败: {e}")
+            return response_content
+
+        # 共用一个客户端，连接池大小足够容纳并发请求；map保持输入顺序
+        with _ClientPool.client(api_key, API_URL) as client:
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(prompts) or 1))) as executor:
+                results = list(executor.map(run, prompts))
+
+        return (results, json.dumps(results, indent=4, ensure_ascii=False),)
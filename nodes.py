@@ -3,15 +3,74 @@ JTnodes implementation for ComfyUI - Optimized version
 """
 import os
 import re
+import io
+import sys
+import csv
+import atexit
 import json
+import marshal
+import struct
+import sqlite3
+import time
+import functools
+import itertools
+import hashlib
+import bisect
+import tarfile
+import zipfile
+import warnings
+import threading
 import torch
 import numpy as np
+from collections import OrderedDict, deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 from PIL.PngImagePlugin import PngInfo
 import openpyxl
 from openpyxl import Workbook
-from .LLM_siliconflow import SiliconflowFreeNode
+from .LLM_siliconflow import SiliconflowFreeNode, SiliconflowBatchNode
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+def _lock_file(fd: int):
+    """对文件加独占锁（跨进程），阻塞直到获得锁"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.01)
+
+def _unlock_file(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@functools.lru_cache(maxsize=None)
+def _prompt_server_class():
+    try:
+        from server import PromptServer
+        return PromptServer
+    except ImportError:  # 不在ComfyUI中运行
+        return None
+
+def _current_prompt_id() -> str:
+    """当前执行的prompt id（不在ComfyUI中运行时为空）"""
+    server_class = _prompt_server_class()
+    instance = getattr(server_class, "instance", None)
+    return str(getattr(instance, "last_prompt_id", None) or "")
 
 class JTBrightnessNode:
     """
@@ -39,19 +98,29 @@ class JTBrightnessNode:
                     "step": 0.1
                 }),
             },
+            "optional": {
+                "chunk_size": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 4096,
+                    "step": 1,
+                    "label": "分块帧数(0为整批处理)"
+                }),
+            },
         }
     
     RETURN_TYPES = ("IMAGE",)
     FUNCTION = "process_image"
     CATEGORY = "JT/image"
 
-    def process_image(self, image: torch.Tensor, brightness: float) -> tuple[torch.Tensor]:
+    def process_image(self, image: torch.Tensor, brightness: float, chunk_size: int = 0) -> tuple[torch.Tensor]:
         """
         Adjust the brightness of the input image.
         
         Args:
             image: Input image tensor of shape (B, H, W, C)
             brightness: Brightness adjustment factor (float between 0.0 and 2.0)
+            chunk_size: Number of frames processed at a time, 0 processes the whole batch
         
         Returns:
             tuple: Contains the processed image tensor with adjusted brightness
@@ -65,7 +134,590 @@ class JTBrightnessNode:
         
         # 应用亮度调整并限制在有效范围内
         # 使用torch内联操作提高性能
-        return (torch.clamp(image * float(brightness), 0.0, 1.0),)
+        if chunk_size <= 0 or chunk_size >= image.shape[0]:
+            return (torch.clamp(image * float(brightness), 0.0, 1.0),)
+
+        # 分块处理：只分配一次输出张量，临时内存不超过一个分块
+        output = torch.empty_like(image)
+        for start in range(0, image.shape[0], chunk_size):
+            end = start + chunk_size
+            torch.mul(image[start:end], float(brightness), out=output[start:end]).clamp_(0.0, 1.0)
+        return (output,)
+
+class JTColorAdjustNode:
+    """
+    Fused color adjustment node: brightness, contrast, gamma, saturation and offset.
+
+    The result matches applying the adjustments one after another, each clamped
+    to [0, 1] like JTBrightnessNode:
+        brightness: x * brightness
+        contrast:   (x - 0.5) * contrast + 0.5
+        gamma:      x ** (1 / gamma)
+        saturation: luma + (x - luma) * saturation, luma = 0.299 R + 0.587 G + 0.114 B
+        offset:     x + offset
+    The batch is processed tile by tile with in-place operations, so every tile goes
+    through all adjustments while it is still in cache and no full-size temporaries are
+    allocated. The output keeps the input dtype; a reduced precision is only used to
+    compute each tile. The alpha channel of RGBA images is left unchanged.
+
+    Attributes:
+        RETURN_TYPES (tuple): Defines the output types for the node
+        FUNCTION (str): Name of the processing function
+        CATEGORY (str): Node category in the UI
+    """
+
+    # 每个分块的元素数量，保证分块能在多次运算之间留在缓存中
+    TILE_ELEMENTS = 1 << 18
+
+    PRECISIONS = {"float32": torch.float32, "float16": torch.float16, "bfloat16": torch.bfloat16}
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        """Define the input types for the node"""
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "brightness": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 2.0, "step": 0.01}),
+                "contrast": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 3.0, "step": 0.01}),
+                "gamma": ("FLOAT", {"default": 1.0, "min": 0.1, "max": 5.0, "step": 0.01}),
+                "saturation": ("FLOAT", {"default": 1.0, "min": 0.0, "max": 3.0, "step": 0.01}),
+                "offset": ("FLOAT", {"default": 0.0, "min": -1.0, "max": 1.0, "step": 0.01}),
+            },
+            "optional": {
+                "precision": (["auto", "float32", "float16", "bfloat16"], {
+                    "default": "auto",
+                    "label": "计算精度"
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE",)
+    FUNCTION = "process_image"
+    CATEGORY = "JT/image"
+
+    def _adjust_tile(self, tile: torch.Tensor, brightness: float, contrast: float,
+                     gamma: float, saturation: float, offset: float):
+        """对单个分块依次原地执行全部调整"""
+        if brightness != 1.0:
+            tile.mul_(brightness).clamp_(0.0, 1.0)
+        if contrast != 1.0:
+            tile.sub_(0.5).mul_(contrast).add_(0.5).clamp_(0.0, 1.0)
+        if gamma != 1.0:
+            tile.pow_(1.0 / gamma).clamp_(0.0, 1.0)
+        if saturation != 1.0 and tile.shape[-1] >= 3:
+            rgb = tile[..., :3]
+            luma = (rgb[..., 0:1] * 0.299).add_(rgb[..., 1:2] * 0.587).add_(rgb[..., 2:3] * 0.114)
+            rgb.sub_(luma).mul_(saturation).add_(luma).clamp_(0.0, 1.0)
+        if offset != 0.0:
+            tile.add_(offset).clamp_(0.0, 1.0)
+
+    def process_image(self, image: torch.Tensor, brightness: float, contrast: float, gamma: float,
+                      saturation: float, offset: float, precision: str = "auto") -> tuple[torch.Tensor]:
+        """
+        Apply all color adjustments in a single tiled pass over the batch.
+
+        Args:
+            image: Input image tensor of shape (B, H, W, C)
+            brightness, contrast, gamma, saturation, offset: Adjustment parameters
+            precision: Compute dtype of each tile, "auto" uses the input dtype
+
+        Returns:
+            tuple: Contains the adjusted image tensor
+
+        Raises:
+            ValueError: If image is not a torch.Tensor
+        """
+        if not isinstance(image, torch.Tensor):
+            raise ValueError("Expected image to be a torch.Tensor")
+
+        # 输入张量可能是上游节点的缓存输出，不能原地修改；输出保持输入精度，
+        # 保证保存、预览等节点可以直接转换为numpy
+        dtype = image.dtype if precision == "auto" else self.PRECISIONS[precision]
+        output = torch.empty_like(image)
+
+        # RGBA图像只调整颜色通道
+        channels = min(image.shape[-1], 3)
+        source = image[..., :channels]
+        target = output[..., :channels]
+        if image.shape[-1] > channels:
+            output[..., channels:] = image[..., channels:]
+
+        # 按帧和行分块，每个分块复制（或转换精度）一次后完成全部调整
+        frames = source if source.dim() == 4 else source.unsqueeze(0)
+        targets = target if target.dim() == 4 else target.unsqueeze(0)
+        row_elements = max(frames.shape[-2] * frames.shape[-1], 1)
+        rows_per_tile = max(self.TILE_ELEMENTS // row_elements, 1)
+        params = (float(brightness), float(contrast), float(gamma), float(saturation), float(offset))
+        for frame, out_frame in zip(frames, targets):
+            for row in range(0, frame.shape[0], rows_per_tile):
+                out_tile = out_frame[row:row + rows_per_tile]
+                if dtype == output.dtype:
+                    tile = out_tile.copy_(frame[row:row + rows_per_tile])
+                    self._adjust_tile(tile, *params)
+                else:
+                    tile = frame[row:row + rows_per_tile].to(dtype)
+                    self._adjust_tile(tile, *params)
+                    out_tile.copy_(tile)
+
+        return (output,)
+
+# 工作流元数据旁路文件目录（位于图片保存目录下）
+METADATA_SIDECAR_DIR = ".jt_metadata"
+
+def _write_metadata_sidecar(folder_path: Path, prompt=None, extra_pnginfo=None) -> str:
+    """将元数据按内容哈希写入旁路文件（已存在则跳过），返回图片中引用的相对路径"""
+    payload = json.dumps({"prompt": prompt, "workflow": extra_pnginfo},
+                         sort_keys=True, ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()
+    reference = f"{METADATA_SIDECAR_DIR}/{digest}.json"
+    sidecar_path = folder_path / reference
+    if not sidecar_path.exists():
+        sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，避免并发写入时读到不完整的内容
+        tmp_path = sidecar_path.with_name(f"{sidecar_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, sidecar_path)
+    return reference
+
+def load_image_metadata(image_path) -> dict:
+    """
+    Read the workflow metadata of an image saved by JTImagesavetopath.
+
+    Works for both embedded metadata and the sidecar mode, where the PNG only carries
+    a "jt_metadata" reference to a content-addressed JSON file next to it.
+
+    Returns:
+        dict: {"prompt": ..., "workflow": ...}; values are None when absent
+    """
+    image_path = Path(image_path)
+    with Image.open(image_path) as img:
+        info = dict(getattr(img, "text", None) or img.info)
+    if reference := info.get("jt_metadata"):
+        return json.loads((image_path.parent / reference).read_text(encoding="utf-8"))
+    return {
+        key: json.loads(info[name]) if name in info else None
+        for key, name in (("prompt", "prompt"), ("workflow", "workflow"))
+    }
+
+class _CounterIndex:
+    """
+    Index of used counter numbers for one "<filename><separator><NNNN><ext>" series in a folder.
+
+    The folder is scanned once and the index is updated as files are reserved, so the
+    next free number is found without probing the filesystem for every candidate. A
+    rescan happens when the folder mtime changes, and each candidate is still checked
+    once with exists() so files added outside the node are never overwritten.
+    """
+
+    _MAX_INDEXES = 64
+    _indexes = OrderedDict()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, folder_path: Path, prefix: str, extension: str, digits: int):
+        self.folder_path = folder_path
+        self.prefix = prefix
+        self.extension = extension
+        self.digits = digits
+        self.used = set()
+        self.pending = {}  # 已分配但尚未写入的路径 -> 序号，重新扫描时保留
+        self.floor = 1  # [1, floor) 范围内的序号均已被占用
+        self.dir_mtime = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def get(cls, folder_path: Path, prefix: str, extension: str, digits: int) -> "_CounterIndex":
+        """获取（或创建）指定序列的索引，并在目录变化时重新扫描"""
+        key = (str(folder_path.resolve()), prefix, extension, digits)
+        with cls._registry_lock:
+            index = cls._indexes.pop(key, None) or cls(folder_path, prefix, extension, digits)
+            cls._indexes[key] = index
+            while len(cls._indexes) > cls._MAX_INDEXES:
+                cls._indexes.popitem(last=False)
+        index.refresh()
+        return index
+
+    def path_for(self, number: int) -> Path:
+        return self.folder_path / f"{self.prefix}{number:0{self.digits}d}{self.extension}"
+
+    def refresh(self):
+        """目录mtime变化时重新扫描（一次scandir）"""
+        with self.lock:
+            mtime = os.stat(self.folder_path).st_mtime_ns
+            if mtime == self.dir_mtime:
+                return
+            used = set()
+            start, end = len(self.prefix), -len(self.extension) if self.extension else None
+            with os.scandir(self.folder_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith(self.prefix) and name.endswith(self.extension)):
+                        continue
+                    number = name[start:end]
+                    # 仅接受与当前位数格式完全一致的序号，例如4位时 "0012" 而非 "12"
+                    if number.isascii() and number.isdigit() and f"{int(number):0{self.digits}d}" == number:
+                        used.add(int(number))
+            self.used = used | set(self.pending.values())
+            self.floor = 1
+            self._advance_floor()
+            self.dir_mtime = mtime
+
+    def sync(self):
+        """记录本节点写入后的目录mtime，避免因自身写入触发重新扫描"""
+        with self.lock:
+            self.dir_mtime = os.stat(self.folder_path).st_mtime_ns
+
+    def invalidate(self):
+        with self.lock:
+            self.dir_mtime = None
+
+    def reserve_next(self, start: int) -> Path:
+        """从start开始查找并占用第一个未使用的序号"""
+        with self.lock:
+            number = max(start, self.floor)
+            while True:
+                while number in self.used:
+                    number += 1
+                save_path = self.path_for(number)
+                if not save_path.exists():  # 目录外部新增文件时的兜底校验
+                    break
+                self.used.add(number)
+            self.used.add(number)
+            self.pending[save_path] = number
+            self._advance_floor()
+            return save_path
+
+    def release(self, paths):
+        """写入结束（成功或失败）后释放占用记录"""
+        with self.lock:
+            for path in paths:
+                self.pending.pop(path, None)
+
+    def _advance_floor(self):
+        while self.floor in self.used:
+            self.floor += 1
+
+class _ShardArchive:
+    """
+    Rolling tar/zip shards for one "<filename>" series in a folder.
+
+    Encoded images are appended to "<filename>_shard<NNNNN>.tar|.zip" until the shard
+    reaches its count or size cap, then a new shard is started. Every member is also
+    recorded in "<filename>_shards.jsonl" (name, shard, data offset, size), which is
+    the source of truth for names already used in the series.
+    """
+
+    _archives = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, folder_path: Path, filename: str, kind: str):
+        self.folder_path = folder_path
+        self.filename = filename
+        self.kind = kind
+        self.index_path = folder_path / f"{filename}_shards.jsonl"
+        self.lock = threading.Lock()
+        self.names = set()
+        self.pending = set()  # 已分配但尚未写入分片的成员名
+        self.shard_number = 0
+        self.shard_count = 0
+        self.index_state = None
+
+    @classmethod
+    def get(cls, folder_path: Path, filename: str, kind: str) -> "_ShardArchive":
+        key = (str(folder_path.resolve()), filename, kind)
+        with cls._registry_lock:
+            if key not in cls._archives:
+                cls._archives[key] = cls(folder_path, filename, kind)
+            return cls._archives[key]
+
+    def shard_path(self, number: int) -> Path:
+        return self.folder_path / f"{self.filename}_shard{number:05d}.{self.kind}"
+
+    def is_taken(self, name: str) -> bool:
+        return name in self.names or name in self.pending
+
+    def _stat_index(self):
+        try:
+            st = self.index_path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def refresh(self):
+        """索引文件被外部修改时重新加载（需持有lock）"""
+        state = self._stat_index()
+        if state is not None and state == self.index_state:
+            return
+        names, counts = set(), {}
+        if state is not None:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        names.add(record["name"])
+                        counts[record["shard"]] = counts.get(record["shard"], 0) + 1
+        self.names = names
+        self.shard_number = 0
+        while self.shard_path(self.shard_number + 1).exists():
+            self.shard_number += 1
+        self.shard_count = counts.get(self.shard_path(self.shard_number).name, 0) if self.shard_number else 0
+        self.index_state = state
+
+    def append(self, members: list, max_count: int, max_bytes: int):
+        """按顺序将 (名称, 数据) 追加到分片中（需持有lock）"""
+        records = []
+        position = 0
+        shard_path = self.shard_path(self.shard_number)
+        shard_size = shard_path.stat().st_size if self.shard_number and shard_path.exists() else 0
+        need_new_shard = not self.shard_number or self.shard_count >= max_count or shard_size >= max_bytes
+        while position < len(members):
+            if need_new_shard:
+                self.shard_number += 1
+                self.shard_count = 0
+            position = self._append_to_shard(self.shard_path(self.shard_number), members,
+                                             position, max_count, max_bytes, records)
+            need_new_shard = True  # 分片只会在写满后提前返回
+
+        # 分片写入完成后再记录索引，保证索引中的条目均已落盘
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.names.update(record["name"] for record in records)
+        self.index_state = self._stat_index()
+
+    def _append_to_shard(self, shard_path: Path, members: list, position: int,
+                         max_count: int, max_bytes: int, records: list) -> int:
+        """向单个分片追加成员直到达到上限，返回下一个待写入成员的位置"""
+        if self.kind == "tar":
+            archive = tarfile.open(shard_path, "a")
+        else:
+            archive = zipfile.ZipFile(shard_path, "a", compression=zipfile.ZIP_STORED)
+        try:
+            while position < len(members):
+                name, data = members[position]
+                size = archive.offset if self.kind == "tar" else archive.fp.tell()
+                # 空分片至少写入一个成员，避免单张图片超过体积上限时无法写入
+                if self.shard_count and (self.shard_count >= max_count or size + len(data) > max_bytes):
+                    break
+                if self.kind == "tar":
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    info.mode = 0o644
+                    archive.addfile(info, io.BytesIO(data))
+                    # 数据块按512字节对齐写在成员头之后
+                    offset = archive.offset - -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+                else:
+                    info = zipfile.ZipInfo(name, time.localtime()[:6])
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")  # 允许覆盖时同名成员会被再次追加
+                        archive.writestr(info, data)
+                    offset = archive.fp.tell() - len(data)  # ZIP_STORED，数据紧跟在成员头之后
+                records.append({"name": name, "shard": shard_path.name, "offset": offset, "size": len(data)})
+                self.shard_count += 1
+                position += 1
+        finally:
+            archive.close()
+        return position
+
+class _HashIndex:
+    """
+    Persistent content-hash index of the images saved in one folder.
+
+    Entries map the hash of a quantized image buffer to the file holding it and are
+    appended to ".jt_hash_index.jsonl" after each successful write; later lines win.
+    Each entry keeps the file's mtime and size, so a file that was overwritten or
+    deleted since it was indexed is never used as a duplicate.
+    """
+
+    FILE_NAME = ".jt_hash_index.jsonl"
+
+    _indexes = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, folder_path: Path):
+        self.folder_path = folder_path
+        self.index_path = folder_path / self.FILE_NAME
+        self.entries = {}  # 哈希 -> (文件名, mtime_ns, 大小)，尚未写入时后两项为None
+        self.digests = {}  # 文件名 -> 哈希
+        self.index_state = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def get(cls, folder_path: Path) -> "_HashIndex":
+        key = str(folder_path.resolve())
+        with cls._registry_lock:
+            if key not in cls._indexes:
+                cls._indexes[key] = cls(folder_path)
+            index = cls._indexes[key]
+        index.refresh()
+        return index
+
+    def _stat_index(self):
+        try:
+            st = self.index_path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def refresh(self):
+        """索引文件被外部修改时重新加载，保留尚未写入的占用记录"""
+        with self.lock:
+            state = self._stat_index()
+            if state == self.index_state:
+                return
+            pending = {digest: entry for digest, entry in self.entries.items() if entry[1] is None}
+            self.entries, self.digests = {}, {}
+            line_count = 0
+            if state is not None:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            self._set(record["hash"], record["file"], record["mtime_ns"], record["size"])
+                            line_count += 1
+            for digest, (name, _, _) in pending.items():
+                self._set(digest, name, None, None)
+            # 覆盖写入会留下过期的行，过多时压缩索引文件
+            if line_count > 2 * len(self.entries) + 1000:
+                self._rewrite()
+            self.index_state = self._stat_index()
+
+    def _rewrite(self):
+        tmp_path = self.index_path.with_name(f"{self.FILE_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for digest, (name, mtime_ns, size) in self.entries.items():
+                if mtime_ns is not None:
+                    f.write(json.dumps({"hash": digest, "file": name, "mtime_ns": mtime_ns, "size": size},
+                                       ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def _set(self, digest: str, name: str, mtime_ns, size):
+        self._discard(self.digests.get(name), name)
+        self.entries[digest] = (name, mtime_ns, size)
+        self.digests[name] = digest
+
+    def _discard(self, digest: str, name: str):
+        if digest is None:
+            return
+        if self.entries.get(digest, (None,))[0] == name:
+            del self.entries[digest]
+        if self.digests.get(name) == digest:
+            del self.digests[name]
+
+    def lookup(self, digest: str, is_pending) -> Path:
+        """返回内容相同且仍然有效的已保存文件，没有则返回None"""
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            name, mtime_ns, size = entry
+            path = self.folder_path / name
+            if is_pending(path):
+                return path
+            try:
+                st = path.stat()
+                if mtime_ns is not None and (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+                    return path
+            except FileNotFoundError:
+                pass
+            self._discard(digest, name)
+            return None
+
+    def reserve(self, digest: str, path: Path):
+        """记录即将写入的文件，使同一批次及后续排队的重复图片也能被识别"""
+        with self.lock:
+            self._set(digest, path.name, None, None)
+
+    def record(self, items: list):
+        """写入成功后持久化 (哈希, 路径) 记录"""
+        with self.lock:
+            lines = []
+            for digest, path in items:
+                st = path.stat()
+                self._set(digest, path.name, st.st_mtime_ns, st.st_size)
+                lines.append(json.dumps({"hash": digest, "file": path.name, "mtime_ns": st.st_mtime_ns,
+                                         "size": st.st_size}, ensure_ascii=False) + "\n")
+            if lines:
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                self.index_state = self._stat_index()
+
+class _BackgroundImageWriter:
+    """
+    Single background thread that runs queued image save jobs in FIFO order.
+
+    submit() blocks while the number of pending jobs is at the caller's limit, which
+    bounds the memory held by queued batches. Failures are printed as they happen and
+    kept until they are raised after the next save has been written or queued, or by
+    JTFlushImageSaves.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.jobs = deque()
+        self.pending = 0
+        self.completed = 0
+        self.errors = []
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="JTImageSaveWriter", daemon=True)
+        self.thread.start()
+        atexit.register(self._shutdown)
+
+    @classmethod
+    def get(cls) -> "_BackgroundImageWriter":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def raise_pending_errors(cls):
+        """抛出此前后台保存中出现的错误（每个错误只报告一次）"""
+        if cls._instance is None:
+            return
+        with cls._instance.condition:
+            errors, cls._instance.errors = cls._instance.errors, []
+        if errors:
+            raise RuntimeError("后台保存图片失败:\n" + "\n".join(errors))
+
+    def submit(self, job, description: str, max_pending: int):
+        """提交保存任务，队列已满时阻塞等待（背压）"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending < max(max_pending, 1))
+            self.jobs.append((job, description))
+            self.pending += 1
+            self.condition.notify_all()
+
+    def wait(self, timeout: float = None) -> bool:
+        """等待所有已提交的任务完成，超时返回False"""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending == 0, timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.jobs)
+                job, description = self.jobs.popleft()
+            try:
+                job()
+            except Exception as e:
+                message = f"{description}: {e}"
+                print(f"[JTImagesavetopath] 后台保存失败 {message}")
+                with self.condition:
+                    self.errors.append(message)
+            finally:
+                with self.condition:
+                    self.pending -= 1
+                    self.completed += 1
+                    self.condition.notify_all()
+
+    def _shutdown(self):
+        """进程退出前写完队列中的图片"""
+        self.wait()
+        if self.errors:
+            print("[JTImagesavetopath] 后台保存失败:\n" + "\n".join(self.errors))
 
 class JTImagesavetopath:
     """
@@ -86,7 +738,7 @@ class JTImagesavetopath:
                     "default": "Image",
                     "multiline": False
                 }),
-                "format": (["PNG", "JPG"], {
+                "format": (["PNG", "JPG", "WEBP", "WEBP_LOSSLESS"], {
                     "default": "JPG"
                 }),
                 "use_counter": ("BOOLEAN", {
@@ -109,28 +761,133 @@ class JTImagesavetopath:
                     "label": "允许覆盖"
                 }),
             },
+            "optional": {
+                "save_workers": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 64,
+                    "step": 1,
+                    "label": "并行保存线程数"
+                }),
+                "metadata_mode": (["embed", "sidecar", "none"], {
+                    "default": "embed",
+                    "label": "元数据保存方式"
+                }),
+                "encode_preset": (["default", "fastest", "fast", "balanced", "smallest"], {
+                    "default": "default",
+                    "label": "编码速度预设"
+                }),
+                "output_mode": (["files", "tar_shards", "zip_shards"], {
+                    "default": "files",
+                    "label": "输出方式"
+                }),
+                "shard_max_count": ("INT", {
+                    "default": 1000,
+                    "min": 1,
+                    "max": 1000000,
+                    "step": 1,
+                    "label": "每个分片最多图片数"
+                }),
+                "shard_max_mb": ("INT", {
+                    "default": 1024,
+                    "min": 1,
+                    "max": 65536,
+                    "step": 1,
+                    "label": "每个分片最大体积(MB)"
+                }),
+                "async_save": ("BOOLEAN", {
+                    "default": False,
+                    "label": "后台异步保存"
+                }),
+                "async_queue_size": ("INT", {
+                    "default": 4,
+                    "min": 1,
+                    "max": 256,
+                    "step": 1,
+                    "label": "后台队列上限(批次)"
+                }),
+                "dedup_mode": (["off", "skip", "hardlink"], {
+                    "default": "off",
+                    "label": "重复图片处理"
+                }),
+                "chunk_size": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 4096,
+                    "step": 1,
+                    "label": "分块帧数(0为整批处理)"
+                }),
+            },
             "hidden": {
                 "prompt": "PROMPT",
                 "extra_pnginfo": "EXTRA_PNGINFO"
             },
         }
     
-    RETURN_TYPES = ("IMAGE", "STRING", "STRING", "INT")
-    RETURN_NAMES = ("image", "save_folder", "save_filename", "save_count")
+    RETURN_TYPES = ("IMAGE", "STRING", "STRING", "INT", "STRING", "INT")
+    RETURN_NAMES = ("image", "save_folder", "save_filename", "save_count", "dedup_filename", "dedup_count")
     FUNCTION = "save_image"
     CATEGORY = "JT/image"
 
+    SEPARATORS = {"none": "", "hyphen": "-", "underscore": "_"}
+
+    # CPU张量未指定分块时，每个分块量化后的uint8数据上限（至少save_workers帧）
+    CPU_CHUNK_BYTES = 32 * 1024 * 1024
+
+    # 后台写入尚未完成的文件路径，不允许覆盖时视为已存在
+    _pending_paths = set()
+    _pending_lock = threading.Lock()
+    EXTENSIONS = {"PNG": ".png", "JPG": ".jpg", "WEBP": ".webp", "WEBP_LOSSLESS": ".webp"}
+
+    # 编码速度预设：从 fastest（编码最快、文件最大）到 smallest（文件最小、编码最慢）
+    # default 保持原有的保存参数
+    ENCODE_PRESETS = {
+        "PNG": {
+            "fastest": {"compress_level": 0},  # 不压缩
+            "fast": {"compress_level": 1},
+            "balanced": {"compress_level": 6},
+            "smallest": {"compress_level": 9, "optimize": True},
+        },
+        "JPG": {
+            "default": {"quality": 95},
+            "fastest": {"quality": 85},  # 降低质量以减小文件，编码速度与default相当
+            "fast": {"quality": 90},
+            "balanced": {"quality": 95, "optimize": True},
+            "smallest": {"quality": 95, "optimize": True, "progressive": True},
+        },
+        "WEBP": {
+            "default": {"quality": 90},
+            "fastest": {"quality": 90, "method": 0},
+            "fast": {"quality": 90, "method": 2},
+            "balanced": {"quality": 90, "method": 2},  # method 3/4 更慢且文件并不更小
+            "smallest": {"quality": 90, "method": 5},  # method 6 更慢但文件并不更小
+        },
+        "WEBP_LOSSLESS": {
+            "default": {"lossless": True},
+            "fastest": {"lossless": True, "quality": 0, "method": 0},
+            "fast": {"lossless": True, "quality": 10, "method": 1},
+            "balanced": {"lossless": True, "quality": 50, "method": 3},
+            "smallest": {"lossless": True, "quality": 100, "method": 4},  # method 5/6 更慢且文件更大
+        },
+    }
+
     def _get_save_path(self, folder_path: Path, filename: str, extension: str,
                       use_counter: bool, separator_type: str, digits: int,
-                      allow_overwrite: bool, index: int = 0) -> Path:
-        """生成保存路径"""
+                      allow_overwrite: bool, index: int = 0, reserved: set = None,
+                      counter_index: _CounterIndex = None, exists=None) -> Path:
+        """生成保存路径（reserved为本批次已分配但尚未写入的路径，exists可替换文件存在性检查）"""
+        exists = exists or Path.exists
+
+        def is_taken(path):
+            return exists(path) or (reserved is not None and path in reserved)
+
         # 处理基本文件路径（不带序号）
         base_path = folder_path / f"{filename}{extension}"
         if not use_counter:
-            return None if not allow_overwrite and base_path.exists() else base_path
+            return None if not allow_overwrite and is_taken(base_path) else base_path
             
         # 获取分隔符并处理序号位数
-        separator = {"none": "", "hyphen": "-", "underscore": "_"}[separator_type]
+        separator = self.SEPARATORS[separator_type]
         digits = min(max(digits, 1), 5)  # 限制在1-5位之间
         current_number = index + 1
 
@@ -142,91 +899,362 @@ class JTImagesavetopath:
         if allow_overwrite:
             return get_path(current_number)
             
-        # 不允许覆盖时查找可用序号
+        # 不允许覆盖时查找可用序号，优先使用目录索引
+        if counter_index is not None:
+            return counter_index.reserve_next(current_number)
         save_path = get_path(current_number)
-        while save_path.exists():
+        while is_taken(save_path):
             current_number += 1
             save_path = get_path(current_number)
             
         return save_path
+
+    def _quantize(self, frames: torch.Tensor) -> np.ndarray:
+        """将一组帧量化为uint8数组
+
+        GPU上整块量化后只拷贝uint8数据到内存；CPU上逐帧量化写入结果数组，
+        浮点临时张量只有一帧大小
+        """
+        if frames.device.type != "cpu":
+            return (frames * 255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+        images = np.empty(tuple(frames.shape), dtype=np.uint8)
+        output = torch.from_numpy(images)
+        for idx, frame in enumerate(frames):
+            output[idx].copy_((frame * 255).clamp_(0, 255))
+        return images
+
+    def _to_pil(self, i: np.ndarray) -> Image.Image:
+        """将单张uint8图像数据转换为PIL图像（直接引用数组内存，不额外拷贝）"""
+        if len(i.shape) == 3 and i.shape[2] == 4:  # 带有alpha通道
+            return Image.fromarray(i, mode='RGBA')
+        # 普通RGB图像
+        return Image.fromarray(i, mode='RGB')
+
+    def _get_save_params(self, format: str, encode_preset: str, mode: str) -> dict:
+        """根据格式与速度预设生成PIL保存参数"""
+        if format == "PNG":
+            save_params = {"format": "PNG"}
+            if encode_preset in self.ENCODE_PRESETS["PNG"]:
+                save_params.update(self.ENCODE_PRESETS["PNG"][encode_preset])
+            elif mode == 'RGBA':
+                save_params["optimize"] = False  # 避免优化影响alpha通道
+                save_params["compress_level"] = 1  # 使用较低压缩率
+            return save_params
+
+        presets = self.ENCODE_PRESETS[format]
+        save_params = {"format": "JPEG" if format == "JPG" else "WEBP"}
+        save_params.update(presets.get(encode_preset, presets["default"]))
+        return save_params
+
+    def _encode_image(self, i: np.ndarray, format: str, pnginfo: PngInfo = None,
+                      encode_preset: str = "default") -> bytes:
+        """将单张图片编码为文件内容（可在工作线程中执行）"""
+        img = self._to_pil(i)
+
+        # 设置保存参数
+        save_params = self._get_save_params(format, encode_preset, img.mode)
+        if format == "PNG" and pnginfo is not None:
+            save_params["pnginfo"] = pnginfo
+
+        buffer = io.BytesIO()
+        img.save(buffer, **save_params)
+        return buffer.getvalue()
+
+    def _write_image(self, i: np.ndarray, save_path: Path, format: str,
+                     pnginfo: PngInfo = None, encode_preset: str = "default",
+                     allow_overwrite: bool = False) -> Path:
+        """编码并写入单张图片（可在工作线程中执行）"""
+        data = self._encode_image(i, format, pnginfo, encode_preset)
+        if allow_overwrite:
+            # 覆盖硬链接文件时先解除链接，避免改动与之共享数据的其他文件
+            try:
+                if save_path.stat().st_nlink > 1:
+                    save_path.unlink()
+            except FileNotFoundError:
+                pass
+        save_path.write_bytes(data)
+        return save_path
+
+    def _hash_image(self, i: np.ndarray, format: str) -> str:
+        """计算量化后图像数据的内容哈希（包含格式与尺寸）"""
+        digest = hashlib.blake2b(f"{format}:{i.shape}".encode("utf-8"), digest_size=16)
+        digest.update(np.ascontiguousarray(i).data)
+        return digest.hexdigest()
+
+    def _link_image(self, link_path: Path, source_path: Path, i: np.ndarray, format: str,
+                    pnginfo: PngInfo, encode_preset: str):
+        """为重复图片创建硬链接，文件系统不支持时退回正常保存"""
+        if link_path == source_path:
+            return
+        link_path.unlink(missing_ok=True)
+        try:
+            os.link(source_path, link_path)
+        except OSError:
+            self._write_image(i, link_path, format, pnginfo, encode_preset)
+
+    def _run_jobs(self, func, jobs: list, save_workers: int) -> list:
+        """按顺序执行任务，save_workers大于1时使用线程池，结果保持提交顺序"""
+        workers = min(max(int(save_workers), 1), len(jobs) or 1)
+        if workers == 1:
+            return [func(*args) for args in jobs]
+        # PIL编码时会释放GIL，使用线程池即可并行压缩与写盘
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="JTImageSave") as pool:
+            futures = [pool.submit(func, *args) for args in jobs]
+            return [future.result() for future in futures]  # 按提交顺序收集结果并抛出错误
     
     def save_image(self, image, folder_path, filename, format, use_counter, 
-                  separator, counter_digits, allow_overwrite, prompt=None, extra_pnginfo=None):
+                  separator, counter_digits, allow_overwrite, save_workers=1,
+                  metadata_mode="embed", encode_preset="default", output_mode="files",
+                  shard_max_count=1000, shard_max_mb=1024, async_save=False, async_queue_size=4,
+                  dedup_mode="off", chunk_size=0, prompt=None, extra_pnginfo=None):
         """Save images with advanced naming options"""
         # 输入验证
         if not isinstance(image, torch.Tensor):
             raise ValueError("Expected image to be a torch.Tensor")
         if not (filename := filename.strip()):
             raise ValueError("Filename cannot be empty")
+
+        # 异步模式下文件名仍在当前线程中按顺序分配，编码与写入交给后台线程
+        submit = None
+        if async_save:
+            writer = _BackgroundImageWriter.get()
+            description = f"{folder_path}/{filename}"
+            submit = lambda job: writer.submit(job, description, async_queue_size)
         
         # 初始化保存环境
         folder_path = Path(folder_path)
         folder_path.mkdir(parents=True, exist_ok=True)
-        extension = ".png" if format == "PNG" else ".jpg"
+        extension = self.EXTENSIONS[format]
         
-        # 处理图像数据
-        images = image.cpu().numpy()
-        if len(images.shape) == 3:
-            images = images[np.newaxis, ...]
-            
-        saved_paths = []
-        
-        # 生成文件路径并保存图片
-        for idx in range(images.shape[0]):
-            save_path = self._get_save_path(
-                folder_path, filename, extension,
-                use_counter, separator, counter_digits,
-                allow_overwrite, idx
-            )
-            
-            if save_path is None:  # 不允许覆盖且文件存在
-                continue
-                
-            # 转换并保存图片
-            # 转换图像数据
-            i = images[idx]
-            if len(i.shape) == 3 and i.shape[2] == 4:  # 带有alpha通道
-                # 分别处理RGB和alpha通道
-                rgb = (i[:, :, :3] * 255).clip(0, 255).astype(np.uint8)
-                alpha = (i[:, :, 3] * 255).clip(0, 255).astype(np.uint8)
-                # 合并通道
-                rgba = np.dstack((rgb, alpha))
-                img = Image.fromarray(rgba, mode='RGBA')
-            else:  # 普通RGB图像
-                rgb = (i * 255).clip(0, 255).astype(np.uint8)
-                img = Image.fromarray(rgb, mode='RGB')
-            
-            # 设置保存参数
-            save_params = {}
-            if format == "PNG":
-                save_params["format"] = "PNG"
-                if img.mode == 'RGBA':
-                    save_params["optimize"] = False  # 避免优化影响alpha通道
-                    save_params["compress_level"] = 1  # 使用较低压缩率
+        # PNG元数据每批次只序列化一次
+        pnginfo = None
+        if format == "PNG" and (prompt or extra_pnginfo) and metadata_mode != "none":
+            pnginfo = PngInfo()
+            if metadata_mode == "sidecar":
+                # 旁路模式：完整元数据写入按内容哈希命名的文件，图片中只保存引用
+                pnginfo.add_text("jt_metadata", _write_metadata_sidecar(folder_path, prompt, extra_pnginfo))
             else:
-                save_params["format"] = "JPEG"
-                save_params["quality"] = 95
-            
-            # 添加PNG元数据
-            if format == "PNG" and (prompt or extra_pnginfo):
-                pnginfo = PngInfo()
                 if prompt:
                     pnginfo.add_text("prompt", json.dumps(prompt))
                 if extra_pnginfo:
                     pnginfo.add_text("workflow", json.dumps(extra_pnginfo))
-                save_params["pnginfo"] = pnginfo
-                
-            img.save(save_path, **save_params)
-            saved_paths.append(save_path)
+
+        # 按分块处理批次，分块内的临时数据用完即释放，峰值内存与分块大小成正比
+        batch = image if image.dim() == 4 else image.unsqueeze(0)
+        step = chunk_size if chunk_size > 0 else max(batch.shape[0], 1)
+        if chunk_size <= 0 and batch.device.type == "cpu":
+            # CPU张量默认按 CPU_CHUNK_BYTES 分块，避免整批的uint8副本
+            frame_bytes = max(batch[0].numel(), 1) if batch.shape[0] else 1
+            step = max(self.CPU_CHUNK_BYTES // frame_bytes, int(save_workers), 1)
+        saved_paths, deduped = [], []
+        for start in range(0, batch.shape[0], step):
+            images = self._quantize(batch[start:start + step])
+
+            if output_mode == "files":
+                chunk_paths, chunk_deduped = self._save_to_files(
+                    images, folder_path, filename, extension, format, use_counter, separator,
+                    counter_digits, allow_overwrite, save_workers, pnginfo, encode_preset, submit,
+                    dedup_mode, start
+                )
+                deduped.extend(chunk_deduped)
+            else:
+                chunk_paths = self._save_to_shards(
+                    images, folder_path, filename, extension, format, use_counter, separator,
+                    counter_digits, allow_overwrite, save_workers, pnginfo, encode_preset,
+                    "tar" if output_mode == "tar_shards" else "zip",
+                    shard_max_count, shard_max_mb * 1024 * 1024, submit, start
+                )
+            saved_paths.extend(chunk_paths)
+
+        # 本批次写入（或排队）完成后再报告此前后台保存中的错误，避免本批次图片丢失
+        _BackgroundImageWriter.raise_pending_errors()
         
         # 返回结果
         return (
             image,                          # 原始图像
             str(folder_path.absolute()),    # 保存目录
             "\n".join(p.name for p in saved_paths) if saved_paths else "",  # 文件名列表
-            len(saved_paths)                # 保存数量
+            len(saved_paths),               # 保存数量
+            "\n".join(deduped),             # 重复图片列表
+            len(deduped)                    # 重复数量
         )
 
+    def _save_to_files(self, images, folder_path, filename, extension, format, use_counter,
+                       separator, counter_digits, allow_overwrite, save_workers,
+                       pnginfo, encode_preset, submit=None, dedup_mode="off", start_index=0) -> tuple:
+        """逐个文件保存，返回 (保存路径列表, 重复图片列表)（submit不为空时交由后台写入）"""
+        # 不覆盖的序号模式使用目录序号索引，避免逐个序号检查文件是否存在
+        counter_index = None
+        if use_counter and not allow_overwrite:
+            counter_index = _CounterIndex.get(
+                folder_path, f"{filename}{self.SEPARATORS[separator]}", extension,
+                min(max(counter_digits, 1), 5)
+            )
+
+        # 内容去重：编码前先对量化后的数据计算哈希
+        hash_index = digests = None
+        if dedup_mode != "off":
+            hash_index = _HashIndex.get(folder_path)
+            digests = self._run_jobs(self._hash_image, [
+                (images[idx], format) for idx in range(images.shape[0])
+            ], save_workers)
+
+        # 先按顺序分配全部文件路径，保证并行写入时文件名与顺序确定
+        saved_paths = []
+        jobs = {}  # 保存路径 -> 图像索引（同一路径重复时仅写入最后一张，与顺序覆盖结果一致）
+        links = []  # (硬链接路径, 已有文件路径, 图像索引)
+        deduped = []
+        reserved = set()
+        with self._pending_lock:
+            is_pending = lambda p: p in self._pending_paths or p in jobs
+            for idx in range(images.shape[0]):
+                existing = None
+                if hash_index is not None:
+                    existing = hash_index.lookup(digests[idx], is_pending)
+                    if existing is not None and dedup_mode == "skip":
+                        deduped.append(existing.name)
+                        continue
+
+                save_path = self._get_save_path(
+                    folder_path, filename, extension,
+                    use_counter, separator, counter_digits,
+                    allow_overwrite, start_index + idx, reserved, counter_index,
+                    exists=lambda p: p in self._pending_paths or p.exists()
+                )
+
+                if save_path is None:  # 不允许覆盖且文件存在
+                    continue
+
+                reserved.add(save_path)
+                if existing is not None:
+                    links.append((save_path, existing, idx))
+                    deduped.append(f"{save_path.name} -> {existing.name}")
+                    continue
+                saved_paths.append(save_path)
+                jobs[save_path] = idx
+                if hash_index is not None:
+                    hash_index.reserve(digests[idx], save_path)
+            self._pending_paths.update(reserved)
+
+        # 编码并写入图片
+        def write_batch():
+            try:
+                self._run_jobs(self._write_image, [
+                    (images[idx], save_path, format, pnginfo, encode_preset, allow_overwrite)
+                    for save_path, idx in jobs.items()
+                ], save_workers)
+                if hash_index is not None:
+                    hash_index.record([(digests[idx], save_path) for save_path, idx in jobs.items()])
+                # 硬链接在源文件写入之后创建
+                for link_path, source_path, idx in links:
+                    self._link_image(link_path, source_path, images[idx], format, pnginfo, encode_preset)
+                if counter_index is not None:
+                    counter_index.sync()  # 记录自身写入后的目录mtime，下次保存无需重新扫描
+            except Exception:
+                if counter_index is not None:
+                    counter_index.invalidate()  # 写入失败时已占用的序号可能未落盘，下次重新扫描
+                raise
+            finally:
+                if counter_index is not None:
+                    counter_index.release(reserved)
+                with self._pending_lock:
+                    self._pending_paths.difference_update(reserved)
+
+        if submit is not None:
+            submit(write_batch)
+        else:
+            write_batch()
+        return saved_paths, deduped
+
+    def _save_to_shards(self, images, folder_path, filename, extension, format, use_counter,
+                        separator, counter_digits, allow_overwrite, save_workers,
+                        pnginfo, encode_preset, kind, max_count, max_bytes, submit=None,
+                        start_index=0) -> list:
+        """追加保存到滚动的tar/zip分片中，分片内的成员名遵循相同的命名规则"""
+        archive = _ShardArchive.get(folder_path, filename, kind)
+        with archive.lock:
+            archive.refresh()
+
+            # 成员名是否已存在以分片索引为准，分配后立即占用，后台写入期间也不会重复
+            saved_paths = []
+            reserved = set()
+            for idx in range(images.shape[0]):
+                save_path = self._get_save_path(
+                    folder_path, filename, extension,
+                    use_counter, separator, counter_digits,
+                    allow_overwrite, start_index + idx, reserved, exists=lambda p: archive.is_taken(p.name)
+                )
+                if save_path is None:
+                    continue
+                reserved.add(save_path)
+                saved_paths.append((idx, save_path))
+            names = [p.name for _, p in saved_paths]
+            archive.pending.update(names)
+
+        def write_batch():
+            try:
+                # 并行编码，再按顺序追加到分片
+                encoded = self._run_jobs(self._encode_image, [
+                    (images[idx], format, pnginfo, encode_preset) for idx, _ in saved_paths
+                ], save_workers)
+                with archive.lock:
+                    archive.append(list(zip(names, encoded)), max_count, max_bytes)
+            finally:
+                with archive.lock:
+                    archive.pending.difference_update(names)
+
+        if submit is not None:
+            submit(write_batch)
+        else:
+            write_batch()
+        return [p for _, p in saved_paths]
+
+class JTFlushImageSaves:
+    """
+    Wait until all background saves queued by JTImagesavetopath are written.
+
+    Connect the image output of the save node so this node runs after it. Errors from
+    the background writer are raised here.
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        """Define the input types for the node"""
+        return {
+            "required": {
+                "timeout_seconds": ("FLOAT", {
+                    "default": 0.0,
+                    "min": 0.0,
+                    "max": 86400.0,
+                    "step": 1.0,
+                    "label": "超时时间(秒，0为一直等待)"
+                }),
+            },
+            "optional": {
+                "image": ("IMAGE",),
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE", "INT")
+    RETURN_NAMES = ("image", "flushed_jobs")
+    FUNCTION = "flush"
+    CATEGORY = "JT/image"
+    OUTPUT_NODE = True
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # 每次执行都需要等待后台队列
+        return float("nan")
+
+    def flush(self, timeout_seconds: float, image=None) -> tuple:
+        """等待后台保存完成并报告错误"""
+        writer = _BackgroundImageWriter.get()
+        completed = writer.completed
+        if not writer.wait(timeout_seconds or None):
+            raise RuntimeError(f"等待后台保存超时，仍有 {writer.pending} 个保存任务未完成")
+        _BackgroundImageWriter.raise_pending_errors()
+        return (image, writer.completed - completed)
+
 class JTcounter:
     """
     A number sequence generator that converts integers into formatted serial numbers.
@@ -292,6 +1320,109 @@ class JTcounter:
         # 格式化为指定位数的字符串
         return (f"{number:0{final_digits}d}",)
 
+class _PeriodicFlusher:
+    """
+    Daemon thread that calls registered flush callbacks about once per second.
+
+    Callbacks receive force=False on the periodic tick and force=True at interpreter
+    exit, when everything still buffered has to reach the disk.
+    """
+
+    INTERVAL = 1.0
+
+    _callbacks = []
+    _lock = threading.Lock()
+    _thread = None
+
+    @classmethod
+    def register(cls, callback):
+        with cls._lock:
+            if callback not in cls._callbacks:
+                cls._callbacks.append(callback)
+            if cls._thread is None:
+                cls._thread = threading.Thread(target=cls._run, name="JTPeriodicFlush", daemon=True)
+                cls._thread.start()
+                atexit.register(cls.flush_all, True)
+
+    @classmethod
+    def _run(cls):
+        while True:
+            time.sleep(cls.INTERVAL)
+            cls.flush_all(False)
+
+    @classmethod
+    def flush_all(cls, force: bool = True):
+        with cls._lock:
+            callbacks = list(cls._callbacks)
+        for callback in callbacks:
+            try:
+                callback(force)
+            except Exception as e:
+                print(f"[JTnodes] 延迟写入失败: {e}")
+
+class _TextAppendCache:
+    """
+    LRU cache of open append handles for JTSaveTextToFile's buffered mode.
+
+    Whether a file already has content is read once with fstat when its handle is
+    opened and then tracked in memory, so each append is a single buffered write.
+    Buffers are flushed once they exceed FLUSH_BYTES, when data has waited longer
+    than FLUSH_DELAY seconds, when a handle is evicted, and at interpreter exit.
+    Changes made to a file by other programs while its handle is cached are not seen.
+    """
+
+    MAX_HANDLES = 32
+    FLUSH_BYTES = 64 * 1024
+    FLUSH_DELAY = 1.0
+
+    _handles = OrderedDict()  # 路径 -> [文件对象, 是否非空, 未落盘字节数, 首次未落盘写入时间]
+    _lock = threading.Lock()
+
+    @classmethod
+    def append(cls, file_path: Path, text: str):
+        """以追加模式写入，文件非空时先写入换行（与直接写入的结果一致）"""
+        key = os.path.abspath(file_path)
+        with cls._lock:
+            entry = cls._handles.pop(key, None)
+            if entry is None:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                f = open(file_path, "a", encoding="utf-8", buffering=cls.FLUSH_BYTES * 2)
+                entry = [f, os.fstat(f.fileno()).st_size > 0, 0, None]
+                while len(cls._handles) >= cls.MAX_HANDLES:
+                    cls._handles.popitem(last=False)[1][0].close()
+            cls._handles[key] = entry
+
+            data = f"\n{text}" if entry[1] else text
+            entry[0].write(data)
+            entry[1] = entry[1] or bool(text)
+            entry[2] += len(data)
+            entry[3] = entry[3] or time.monotonic()
+            if entry[2] >= cls.FLUSH_BYTES:
+                cls._flush_entry(entry)
+        _PeriodicFlusher.register(cls.flush)
+
+    @classmethod
+    def discard(cls, file_path: Path):
+        """落盘并关闭指定文件的缓存句柄（覆盖写入或直接写入前调用）"""
+        with cls._lock:
+            entry = cls._handles.pop(os.path.abspath(file_path), None)
+            if entry is not None:
+                entry[0].close()
+
+    @classmethod
+    def flush(cls, force: bool = True):
+        """落盘缓冲数据，force为False时只处理等待超过FLUSH_DELAY的文件"""
+        now = time.monotonic()
+        with cls._lock:
+            for entry in cls._handles.values():
+                if entry[3] is not None and (force or now - entry[3] >= cls.FLUSH_DELAY):
+                    cls._flush_entry(entry)
+
+    @staticmethod
+    def _flush_entry(entry):
+        entry[0].flush()
+        entry[2], entry[3] = 0, None
+
 class JTSaveTextToFile:
     """文本文件保存节点，支持追加和覆盖模式
     
@@ -299,7 +1430,14 @@ class JTSaveTextToFile:
         RETURN_TYPES (tuple): 定义输出类型为STRING
         FUNCTION (str): 处理函数名
         CATEGORY (str): 节点分类
+
+    Notes:
+        - 覆盖模式下输入不变时使用ComfyUI缓存；目标文件在节点写入后被修改或删除时重新执行
+        - 追加模式下输入不变时不重复追加
     """
+
+    # 文件路径 -> (本节点写入后的文件状态, 写入时的IS_CHANGED值, 序号)
+    _written_states = {}
     
     @classmethod
     def INPUT_TYPES(cls):
@@ -322,13 +1460,38 @@ class JTSaveTextToFile:
                     "label": "写入模式"
                 }),
             },
-        }
-    
+            "optional": {
+                "buffered": ("BOOLEAN", {
+                    "default": False,
+                    "label": "缓冲追加(延迟落盘)"
+                }),
+            },
+        }
+    
     RETURN_TYPES = ("STRING",)
     FUNCTION = "save_text"
     CATEGORY = "JT/text"
 
-    def save_text(self, text: str, folder_path: str, filename: str, write_mode: str) -> tuple[str]:
+    @classmethod
+    def _state_token(cls, file_path: Path) -> str:
+        """文件自本节点上次写入后未被修改时返回相同的值"""
+        key = os.path.abspath(file_path)
+        state = _file_state(file_path)
+        recorded = cls._written_states.get(key)
+        if recorded is None:
+            return f"{key}:{state}:0"
+        if recorded[0] == state:
+            return recorded[1]
+        return f"{key}:{state}:{recorded[2] + 1}"
+
+    @classmethod
+    def IS_CHANGED(cls, folder_path: str = "", filename: str = "", write_mode: str = "append", **kwargs):
+        if write_mode != "overwrite":
+            return ""
+        return cls._state_token(Path(folder_path) / filename)
+
+    def save_text(self, text: str, folder_path: str, filename: str, write_mode: str,
+                  buffered: bool = False) -> tuple[str]:
         """保存文本到文件
         
         Args:
@@ -336,16 +1499,25 @@ class JTSaveTextToFile:
             folder_path: 保存目录
             filename: 文件名
             write_mode: 写入模式(append/overwrite)
+            buffered: 追加模式下复用缓存的文件句柄，按大小/时间策略延迟落盘
         """
-        # 创建保存目录
-        save_path = Path(folder_path)
-        save_path.mkdir(parents=True, exist_ok=True)
-        
         # 完整文件路径
+        save_path = Path(folder_path)
         file_path = save_path / filename
+
+        # 缓冲追加：复用已打开的句柄，不再逐次创建目录、打开和检查文件
+        if buffered and write_mode == 'append':
+            _TextAppendCache.append(file_path, text)
+            return (text,)
+        # 直接写入前先落盘并关闭缓存句柄，保证写入顺序
+        _TextAppendCache.discard(file_path)
+
+        # 创建保存目录
+        save_path.mkdir(parents=True, exist_ok=True)
         
         # 写入模式
         mode = 'a' if write_mode == 'append' else 'w'
+        token = self._state_token(file_path) if mode == 'w' else None
         
         # 写入文件
         with open(file_path, mode, encoding='utf-8') as f:
@@ -353,9 +1525,556 @@ class JTSaveTextToFile:
             if mode == 'a' and file_path.exists() and file_path.stat().st_size > 0:
                 f.write('\n')
             f.write(text)
+
+        # 记录写入后的文件状态，文件未被其他程序修改时IS_CHANGED保持不变
+        if token is not None:
+            key = os.path.abspath(file_path)
+            generation = self._written_states[key][2] + 1 if key in self._written_states else 1
+            self._written_states[key] = (_file_state(file_path), token, generation)
             
         return (text,)
 
+class _RecordLog:
+    """
+    Batched, lock-protected appends of JSONL/CSV records shared by several processes.
+
+    Records are buffered per file and written with a single O_APPEND write while an
+    exclusive file lock is held, so many ComfyUI workers can log to the same file.
+    A buffer is written once it holds batch_size records, after FLUSH_DELAY seconds
+    and at interpreter exit. The CSV header is written under the lock when the file
+    is empty.
+    """
+
+    FIELDS = ["timestamp", "prompt_id", "node_id", "filename", "text"]
+    FLUSH_DELAY = 1.0
+
+    _buffers = {}  # 路径 -> [格式, 记录列表, 首条记录时间]
+    _lock = threading.Lock()
+
+    @classmethod
+    def add(cls, file_path: Path, record_format: str, record: dict, batch_size: int):
+        key = os.path.abspath(file_path)
+        with cls._lock:
+            buffer = cls._buffers.get(key)
+            if buffer is not None and buffer[0] != record_format:
+                cls._write(key, *cls._buffers.pop(key)[:2])
+                buffer = None
+            if buffer is None:
+                buffer = cls._buffers[key] = [record_format, [], time.monotonic()]
+            buffer[1].append(record)
+            if len(buffer[1]) >= batch_size:
+                cls._write(key, *cls._buffers.pop(key)[:2])
+        _PeriodicFlusher.register(cls.flush)
+
+    @classmethod
+    def flush(cls, force: bool = True):
+        """写出缓冲的记录，force为False时只处理等待超过FLUSH_DELAY的文件"""
+        now = time.monotonic()
+        with cls._lock:
+            for key in [k for k, b in cls._buffers.items() if force or now - b[2] >= cls.FLUSH_DELAY]:
+                cls._write(key, *cls._buffers.pop(key)[:2])
+
+    @classmethod
+    def _write(cls, path: str, record_format: str, records: list):
+        if record_format == "csv":
+            buffer = io.StringIO()
+            csv.DictWriter(buffer, fieldnames=cls.FIELDS, lineterminator="\n").writerows(records)
+            data = buffer.getvalue()
+        else:
+            data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            _lock_file(fd)
+            try:
+                if record_format == "csv" and os.fstat(fd).st_size == 0:
+                    data = ",".join(cls.FIELDS) + "\n" + data
+                os.write(fd, data.encode("utf-8"))
+            finally:
+                _unlock_file(fd)
+        finally:
+            os.close(fd)
+
+class JTSaveTextRecord:
+    """结构化文本记录节点，以JSONL或CSV格式追加记录
+
+    每条记录包含时间戳、prompt id、节点id、关联文件名和文本。多个ComfyUI进程
+    可同时写入同一个文件：记录按批次在文件锁保护下一次性追加。
+
+    Attributes:
+        RETURN_TYPES (tuple): 定义输出类型为STRING
+        FUNCTION (str): 处理函数名
+        CATEGORY (str): 节点分类
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "text": ("STRING", {
+                    "default": "",
+                    "multiline": True
+                }),
+                "folder_path": ("STRING", {
+                    "default": "/path",
+                    "multiline": False
+                }),
+                "filename": ("STRING", {
+                    "default": "records.jsonl",
+                    "multiline": False
+                }),
+                "record_format": (["jsonl", "csv"], {
+                    "default": "jsonl",
+                    "label": "记录格式"
+                }),
+            },
+            "optional": {
+                "record_filename": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "label": "关联文件名"
+                }),
+                "batch_size": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 10000,
+                    "step": 1,
+                    "label": "每批写入记录数"
+                }),
+            },
+            "hidden": {
+                "unique_id": "UNIQUE_ID"
+            },
+        }
+
+    RETURN_TYPES = ("STRING",)
+    FUNCTION = "save_record"
+    CATEGORY = "JT/text"
+
+    def save_record(self, text: str, folder_path: str, filename: str, record_format: str,
+                    record_filename: str = "", batch_size: int = 1, unique_id=None) -> tuple[str]:
+        """追加一条结构化记录
+        
+        Args:
+            text: 文本内容
+            folder_path: 保存目录
+            filename: 文件名
+            record_format: 记录格式(jsonl/csv)
+            record_filename: 记录中的关联文件名(例如保存的图片名)
+            batch_size: 累积多少条记录后加锁写入一次(超过1秒未写满也会写入)
+        """
+        record = {
+            "timestamp": datetime.now().astimezone().isoformat(timespec="milliseconds"),
+            "prompt_id": _current_prompt_id(),
+            "node_id": str(unique_id or ""),
+            "filename": record_filename,
+            "text": text,
+        }
+        _RecordLog.add(Path(folder_path) / filename, record_format, record, batch_size)
+        return (text,)
+
+def _get_or_create_sheet(wb, sheet_name: str):
+    """获取或创建工作表"""
+    if sheet_name in wb.sheetnames:
+        return wb[sheet_name]
+    ws = wb.create_sheet(sheet_name)
+    # 如果是默认的Sheet且不是目标工作表，删除它
+    if "Sheet" in wb.sheetnames and sheet_name != "Sheet":
+        wb.remove(wb["Sheet"])
+    return ws
+
+def _last_used_row(ws) -> int:
+    """工作表最后一个非空行的行号（空表为0），从末行向上查找"""
+    for row in range(ws.max_row, 0, -1):
+        values = next(ws.iter_rows(min_row=row, max_row=row, values_only=True), ())
+        if any(value is not None for value in values):
+            return row
+    return 0
+
+def _file_state(file_path: Path):
+    """文件的 (mtime_ns, 大小)，文件不存在时返回None"""
+    try:
+        st = os.stat(file_path)
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+@functools.lru_cache(maxsize=64)
+def _content_digest(abs_path: str, state: tuple) -> str:
+    """文件内容哈希，按 (路径, mtime, 大小) 缓存，文件未变化时不重复读取"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(abs_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _file_fingerprint(paths: list, content_hash: bool = False) -> str:
+    """由文件路径、mtime、大小（可选内容哈希）组成的指纹，用于IS_CHANGED"""
+    parts = []
+    for path in paths:
+        abs_path = os.path.abspath(path)
+        state = _file_state(path)
+        part = f"{abs_path}:{state}"
+        if content_hash and state is not None:
+            part += f":{_content_digest(abs_path, state)}"
+        parts.append(part)
+    return "|".join(parts)
+
+def _table_fingerprint(folder_path: str, filename: str, backend: str = "xlsx",
+                       content_hash: bool = False):
+    """Excel/SQLite表格文件的指纹（SQLite包含-wal文件），只读不写
+
+    路径无法确定（例如来自连线输入、检查时尚无取值）或出错时返回NaN使节点总是执行
+    """
+    if not isinstance(folder_path, str) or not isinstance(filename, str) or not filename:
+        return float("nan")
+    try:
+        if backend == "sqlite":
+            db_path = _SqliteTable.path_for(folder_path, filename)
+            return _file_fingerprint([db_path, db_path.with_name(f"{db_path.name}-wal")], content_hash)
+        if not any(filename.endswith(ext) for ext in ['.xlsx', '.xls']):
+            filename = f"{filename}.xlsx"
+        file_path = Path(folder_path) / filename
+        # 延迟保存的单元格尚未写入文件，计入其哈希而不是先保存
+        return f"{_file_fingerprint([file_path], content_hash)}|{_WorkbookCache.pending_digest(file_path)}"
+    except Exception:
+        return float("nan")
+
+class _WorkbookCache:
+    """
+    Process-level cache of open workbooks for write-behind Excel cell writes.
+
+    Cell writes go to the cached workbook and are saved in one wb.save() when the
+    workbook has been idle for its flush delay, once the number of unsaved cells
+    reaches its threshold, through JT Flush Excel Writes, before a reader node opens
+    the file, and at interpreter exit. If the file changes on disk (mtime or size)
+    while cached, it is reloaded and the unsaved cells are applied again, so the
+    saved file matches what a load/save per write would produce.
+    """
+
+    MAX_WORKBOOKS = 8
+    # 延迟保存节点的默认参数：空闲秒数与累计单元格数
+    FLUSH_DELAY = 2.0
+    FLUSH_AFTER_CELLS = 100
+
+    _entries = OrderedDict()  # 路径 -> _WorkbookCache实例
+    _lock = threading.RLock()
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.wb = None
+        self.state = None
+        self.pending = {}  # (工作表, 行, 列) -> 值，尚未保存的单元格
+        self.next_rows = {}  # 工作表 -> 下一空行，供追加写入使用
+        self.last_write = None
+        self.flush_delay = 0.0
+        self.error = None
+
+    @classmethod
+    def write(cls, file_path: Path, sheet_name: str, cells: list,
+              flush_delay: float, flush_after_cells: int, append: bool = False) -> int:
+        """写入 (行, 列, 值) 单元格列表（延迟保存）
+
+        append为True时行号相对于工作表的下一空行（从0开始），返回实际的起始行号
+        """
+        with cls._lock:
+            key = os.path.abspath(file_path)
+            entry = cls._entries.pop(key, None) or cls(file_path)
+            cls._entries[key] = entry
+            # 按LRU淘汰：保存成功后才移出缓存，保存失败的工作簿保留未保存的单元格，稍后重试
+            for old_key in list(cls._entries)[:-1]:
+                if len(cls._entries) <= cls.MAX_WORKBOOKS:
+                    break
+                try:
+                    cls._entries[old_key].save()
+                except Exception as e:
+                    print(f"[JTSaveTextToExcel] 保存 {old_key} 失败，保留在缓存中稍后重试: {e}")
+                    continue
+                del cls._entries[old_key]
+
+            entry.load()
+            ws = _get_or_create_sheet(entry.wb, sheet_name)
+            if append and sheet_name not in entry.next_rows:
+                entry.next_rows[sheet_name] = _last_used_row(ws) + 1
+            base_row = entry.next_rows[sheet_name] if append else 0
+            for row, column, value in cells:
+                ws.cell(row=base_row + row, column=column, value=value)
+                entry.pending[(sheet_name, base_row + row, column)] = value
+                if sheet_name in entry.next_rows:
+                    entry.next_rows[sheet_name] = max(entry.next_rows[sheet_name], base_row + row + 1)
+            entry.last_write = time.monotonic()
+            entry.flush_delay = flush_delay
+            if entry.error is not None or len(entry.pending) >= flush_after_cells:
+                entry.save()
+        _PeriodicFlusher.register(cls.flush_idle)
+        return base_row
+
+    @classmethod
+    def flush(cls, file_path: Path = None, discard: bool = False) -> int:
+        """保存指定文件（或全部文件）的未保存单元格，返回保存的单元格数"""
+        with cls._lock:
+            if file_path is None:
+                keys = list(cls._entries)
+            else:
+                keys = [os.path.abspath(file_path)]
+            count = 0
+            for key in keys:
+                entry = cls._entries.get(key)
+                if entry is None:
+                    continue
+                count += len(entry.pending)
+                entry.save()
+                if discard:
+                    del cls._entries[key]
+            return count
+
+    @classmethod
+    def pending_digest(cls, file_path: Path) -> str:
+        """指定文件未保存单元格的哈希（没有时为空字符串），不保存文件"""
+        with cls._lock:
+            entry = cls._entries.get(os.path.abspath(file_path))
+            if entry is None or not entry.pending:
+                return ""
+            items = repr(list(entry.pending.items()))
+        return hashlib.blake2b(items.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+    @classmethod
+    def flush_idle(cls, force: bool = True):
+        """保存空闲时间超过各自延迟的工作簿，后台保存失败的工作簿等待下次写入或手动保存"""
+        now = time.monotonic()
+        with cls._lock:
+            for entry in cls._entries.values():
+                if not entry.pending or (entry.error is not None and not force):
+                    continue
+                if force or now - entry.last_write >= entry.flush_delay:
+                    try:
+                        entry.save()
+                    except Exception as e:
+                        print(f"[JTSaveTextToExcel] 保存 {entry.file_path} 失败，将在下次写入时重试: {e}")
+
+    def load(self):
+        """首次使用或文件被外部修改时（重新）加载工作簿，并重新应用未保存的单元格"""
+        state = _file_state(self.file_path)
+        if self.wb is not None and state == self.state:
+            return
+        self.wb = openpyxl.load_workbook(self.file_path) if state is not None else Workbook()
+        self.state = state
+        self.next_rows = {}
+        for (sheet_name, row, column), value in self.pending.items():
+            _get_or_create_sheet(self.wb, sheet_name).cell(row=row, column=column, value=value)
+
+    def save(self):
+        if not self.pending:
+            return
+        try:
+            self.load()
+            self.wb.save(self.file_path)
+        except Exception as e:
+            self.error = e
+            raise
+        self.error = None
+        self.pending.clear()
+        self.state = _file_state(self.file_path)
+
+TABLE_BACKENDS = ["xlsx", "sqlite"]
+
+def _prefix_successor(text: str):
+    """大于所有以text开头的字符串的最小字符串，不存在时返回None"""
+    while text:
+        last = ord(text[-1])
+        if last < sys.maxunicode:
+            return text[:-1] + chr(last + 1)
+        text = text[:-1]
+    return None
+
+class _SqliteTable:
+    """
+    SQLite table backend for the Excel nodes (backend="sqlite").
+
+    Cells are stored as text in "<filename>.sqlite" next to where the .xlsx would be,
+    one row per (sheet, row, column), with indexes on the value and on its casefolded
+    form for lookups. The database runs in WAL mode, so several ComfyUI processes can
+    read while one writes; each call uses its own short-lived connection. A sheet
+    name of None means the first sheet that was written, like the active sheet of a
+    workbook. JT Export Table to Excel writes the .xlsx in one pass when needed.
+    """
+
+    TIMEOUT = 30.0
+
+    @staticmethod
+    def path_for(folder_path, filename: str) -> Path:
+        """数据库文件路径：去掉 .xlsx/.xls 扩展名后加 .sqlite"""
+        stem = next((filename[:-len(ext)] for ext in ('.xlsx', '.xls') if filename.endswith(ext)), filename)
+        return Path(folder_path) / f"{stem}.sqlite"
+
+    @classmethod
+    def connect(cls, db_path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path, timeout=cls.TIMEOUT, isolation_level=None)
+        # 每次连接都确认表结构存在（开销很小），数据库文件被删除或替换后也能继续使用
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sheets (
+                position INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS cells (
+                sheet TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                col INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                folded TEXT NOT NULL,
+                PRIMARY KEY (sheet, row, col)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS cells_value ON cells (sheet, value);
+            CREATE INDEX IF NOT EXISTS cells_folded ON cells (sheet, folded);
+        """)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _resolve_sheet(conn: sqlite3.Connection, sheet_name: str = None) -> str:
+        """未指定工作表时返回第一个写入的工作表"""
+        if sheet_name:
+            return sheet_name
+        found = conn.execute("SELECT name FROM sheets ORDER BY position LIMIT 1").fetchone()
+        return found[0] if found else "Sheet1"
+
+    @classmethod
+    def write_cells(cls, db_path: Path, sheet_name: str, cells: list, append: bool = False) -> int:
+        """在一个事务中写入 (行, 列, 值) 列表
+
+        append为True时行号相对于工作表的下一空行（从0开始），返回实际的起始行号
+        """
+        conn = cls.connect(db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("INSERT OR IGNORE INTO sheets (name) VALUES (?)", (sheet_name,))
+                base_row = 0
+                if append:
+                    last = conn.execute("SELECT MAX(row) FROM cells WHERE sheet = ?",
+                                        (sheet_name,)).fetchone()[0]
+                    base_row = (last or 0) + 1
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cells (sheet, row, col, value, folded) VALUES (?, ?, ?, ?, ?)",
+                    [(sheet_name, base_row + row, column, str(value), str(value).casefold())
+                     for row, column, value in cells]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return base_row
+        finally:
+            conn.close()
+
+    @classmethod
+    def cell_value(cls, db_path: Path, sheet_name: str, row: int, column: int):
+        """读取单元格的值，超出表格范围时抛出ValueError（与xlsx一致）"""
+        if not db_path.exists():
+            raise FileNotFoundError(f"No such file: '{db_path}'")
+        conn = cls.connect(db_path)
+        try:
+            sheet = cls._resolve_sheet(conn, sheet_name)
+            max_row, max_column = conn.execute(
+                "SELECT MAX(row), MAX(col) FROM cells WHERE sheet = ?", (sheet,)).fetchone()
+            if row > (max_row or 1):
+                raise ValueError(f"Row number {row} exceeds maximum row {max_row or 1}")
+            if column > (max_column or 1):
+                raise ValueError(f"Column number {column} exceeds maximum column {max_column or 1}")
+            found = conn.execute("SELECT value FROM cells WHERE sheet = ? AND row = ? AND col = ?",
+                                 (sheet, row, column)).fetchone()
+            return found[0] if found else None
+        finally:
+            conn.close()
+
+    @classmethod
+    def find_text(cls, db_path: Path, sheet_name: str, text: str, output_column: int,
+                  key_column: int = 0, match_mode: str = "exact") -> tuple[str, int, int]:
+        """查找第一个匹配的非空单元格（行优先），返回 (输出列文本, 行号, 列号)"""
+        if not db_path.exists():
+            raise FileNotFoundError(f"No such file: '{db_path}'")
+        if not text:
+            return ("", 0, 0)
+        if match_mode == "exact":
+            condition, params = "value = ?", [text]
+        elif match_mode == "case_insensitive":
+            condition, params = "folded = ?", [text.casefold()]
+        elif match_mode == "prefix":
+            successor = _prefix_successor(text)
+            condition, params = ("value >= ? AND value < ?", [text, successor]) if successor else ("value >= ?", [text])
+        else:
+            condition, params = "instr(value, ?) > 0", [text]
+        if key_column:
+            condition += " AND col = ?"
+            params.append(key_column)
+
+        conn = cls.connect(db_path)
+        try:
+            sheet = cls._resolve_sheet(conn, sheet_name)
+            found = conn.execute(
+                f"SELECT row, col FROM cells WHERE sheet = ? AND {condition} ORDER BY row, col LIMIT 1",
+                [sheet] + params).fetchone()
+            if found is None:
+                return ("", 0, 0)
+            row, column = found
+            output = conn.execute("SELECT value FROM cells WHERE sheet = ? AND row = ? AND col = ?",
+                                  (sheet, row, output_column)).fetchone()
+            return (output[0] if output else "", row, column)
+        finally:
+            conn.close()
+
+    @classmethod
+    def read_rows(cls, db_path: Path, sheet_name: str, start_row: int, count: int) -> tuple[list, bool]:
+        """读取从start_row开始的count行，返回 ([(行号, 值元组)], 是否已到表格末尾)"""
+        if not db_path.exists():
+            raise FileNotFoundError(f"No such file: '{db_path}'")
+        conn = cls.connect(db_path)
+        try:
+            sheet = cls._resolve_sheet(conn, sheet_name)
+            max_row = conn.execute("SELECT MAX(row) FROM cells WHERE sheet = ?", (sheet,)).fetchone()[0] or 0
+            end_row = min(start_row + count, max_row + 1)
+            rows = {row: [] for row in range(start_row, end_row)}
+            for row, column, value in conn.execute(
+                    "SELECT row, col, value FROM cells WHERE sheet = ? AND row >= ? AND row < ? ORDER BY row, col",
+                    (sheet, start_row, end_row)):
+                values = rows[row]
+                values.extend([None] * (column - 1 - len(values)))
+                values.append(value)
+            return [(row, tuple(values)) for row, values in rows.items()], end_row > max_row
+        finally:
+            conn.close()
+
+    @classmethod
+    def export_xlsx(cls, db_path: Path, xlsx_path: Path) -> int:
+        """将所有工作表一次性写入xlsx（write_only模式逐行写出），返回写入的单元格数"""
+        conn = cls.connect(db_path)
+        try:
+            wb = Workbook(write_only=True)
+            count = 0
+            sheets = [name for (name,) in conn.execute("SELECT name FROM sheets ORDER BY position")]
+            for sheet in sheets or ["Sheet1"]:
+                ws = wb.create_sheet(sheet)
+                current_row, values = 1, []
+                for row, column, value in conn.execute(
+                        "SELECT row, col, value FROM cells WHERE sheet = ? ORDER BY row, col", (sheet,)):
+                    while current_row < row:
+                        ws.append(values)
+                        current_row, values = current_row + 1, []
+                    values.extend([None] * (column - 1 - len(values)))
+                    values.append(value)
+                    count += 1
+                ws.append(values)
+        finally:
+            conn.close()
+
+        # 先写临时文件再替换，读取节点不会读到不完整的文件
+        tmp_path = xlsx_path.with_name(f"{xlsx_path.name}.{os.getpid()}.tmp")
+        wb.save(tmp_path)
+        os.replace(tmp_path, xlsx_path)
+        return count
+
 class JTSaveTextToExcel:
     """Excel表格保存节点
     
@@ -370,98 +2089,1080 @@ class JTSaveTextToExcel:
         - 自动创建或更新工作表
         - 如果输入文本包含多行，仅保存第一行
         - 输出实际保存到表格中的内容（第一行文本）
+        - backend为sqlite时保存到同名.sqlite文件（见_SqliteTable）
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "text": ("STRING", {
+                    "default": "",
+                    "multiline": True
+                }),
+                "folder_path": ("STRING", {
+                    "default": "/path",
+                    "multiline": False
+                }),
+                "filename": ("STRING", {
+                    "default": "output",
+                    "multiline": False
+                }),
+                "sheet_name": ("STRING", {
+                    "default": "Sheet1",
+                    "multiline": False
+                }),
+                "row": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 1048576,  # Excel最大行数
+                    "step": 1
+                }),
+                "column": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 16384,  # Excel最大列数
+                    "step": 1
+                })
+            },
+            "optional": {
+                "write_behind": ("BOOLEAN", {
+                    "default": False,
+                    "label": "缓存工作簿并延迟保存"
+                }),
+                "flush_delay_seconds": ("FLOAT", {
+                    "default": _WorkbookCache.FLUSH_DELAY,
+                    "min": 0.0,
+                    "max": 3600.0,
+                    "step": 0.5,
+                    "label": "空闲多少秒后保存"
+                }),
+                "flush_after_cells": ("INT", {
+                    "default": _WorkbookCache.FLUSH_AFTER_CELLS,
+                    "min": 1,
+                    "max": 1000000,
+                    "step": 1,
+                    "label": "累计多少个单元格后保存"
+                }),
+                "backend": (TABLE_BACKENDS, {
+                    "default": "xlsx",
+                    "label": "存储格式"
+                }),
+            },
+        }
+    
+    RETURN_TYPES = ("STRING",)
+    FUNCTION = "save_to_excel"
+    CATEGORY = "JT/text"
+
+    def save_to_excel(self, text: str, folder_path: str, filename: str,
+                     sheet_name: str, row: int, column: int, write_behind: bool = False,
+                     flush_delay_seconds: float = _WorkbookCache.FLUSH_DELAY,
+                     flush_after_cells: int = _WorkbookCache.FLUSH_AFTER_CELLS,
+                     backend: str = "xlsx") -> tuple[str]:
+        """保存文本到Excel表格
+        
+        Args:
+            text: 文本内容
+            folder_path: 保存目录
+            filename: 文件名(可带扩展名)
+            sheet_name: 工作表名
+            row: 起始行号
+            column: 起始列号
+            write_behind: 缓存工作簿，合并多次写入后再保存
+            flush_delay_seconds: 延迟保存模式下空闲多少秒后保存
+            flush_after_cells: 延迟保存模式下累计多少个未保存单元格后立即保存
+            backend: 存储格式，xlsx或sqlite（sqlite模式下每次写入都是一个事务，不使用延迟保存）
+        """
+        # 创建保存目录
+        save_path = Path(folder_path)
+        save_path.mkdir(parents=True, exist_ok=True)
+        
+        # 处理文件名
+        try:
+            # 处理文件扩展名
+            if not any(filename.endswith(ext) for ext in ['.xlsx', '.xls']):
+                filename = f"{filename}.xlsx"
+            
+            # 完整文件路径
+            file_path = save_path / filename
+            
+            # 处理文本内容（如果有多行，只取第一行）
+            first_line = text.split('\n')[0] if text else ""
+
+            # SQLite存储：直接写入数据库
+            if backend == "sqlite":
+                _SqliteTable.write_cells(_SqliteTable.path_for(save_path, filename), sheet_name,
+                                         [(row, column, first_line)])
+                return (first_line,)
+
+            # 延迟保存模式：写入缓存的工作簿
+            if write_behind:
+                _WorkbookCache.write(file_path, sheet_name, [(row, column, first_line)],
+                                     flush_delay_seconds, flush_after_cells)
+                return (first_line,)
+            # 直接保存前先写出该文件缓存中的单元格
+            _WorkbookCache.flush(file_path, discard=True)
+
+            # 获取或创建工作簿
+            wb = openpyxl.load_workbook(file_path) if file_path.exists() else Workbook()
+            
+            # 获取或创建工作表
+            ws = _get_or_create_sheet(wb, sheet_name)
+            
+            # 写入文本内容
+            ws.cell(row=row, column=column, value=first_line)
+            
+            # 保存文件
+            wb.save(file_path)
+            
+        except Exception as e:
+            raise RuntimeError(f"保存Excel文件时出错: {str(e)}")
+        
+        # 返回实际保存的内容
+        return (first_line,)
+
+class JTSaveTableToExcel:
+    """Excel批量写入节点，一次加载/保存写入整行、整列或二维区域
+
+    Attributes:
+        RETURN_TYPES (tuple): 定义输出类型
+        FUNCTION (str): 处理函数名
+        CATEGORY (str): 节点分类
+
+    Notes:
+        - 文本可以是列表，也可以是多行文本；多行文本每行为一条，行内以Tab分隔
+        - row: 所有值写入从(row, column)开始的一行
+        - column: 所有值写入从(row, column)开始的一列
+        - range: 每行文本写入一行，行内Tab分隔的值写入相邻的列
+        - 追加模式下忽略row，从工作表的下一空行开始写入；下一空行在内存中记录，
+          文件未被外部修改时不会重复查找
+    """
+
+    # 工作簿路径与工作表 -> (文件状态, 下一空行)，按LRU保留最近使用的记录
+    MAX_NEXT_ROWS = 256
+    _next_rows = OrderedDict()
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "text": ("STRING", {
+                    "default": "",
+                    "multiline": True
+                }),
+                "folder_path": ("STRING", {
+                    "default": "/path",
+                    "multiline": False
+                }),
+                "filename": ("STRING", {
+                    "default": "output",
+                    "multiline": False
+                }),
+                "sheet_name": ("STRING", {
+                    "default": "Sheet1",
+                    "multiline": False
+                }),
+                "row": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 1048576,  # Excel最大行数
+                    "step": 1
+                }),
+                "column": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 16384,  # Excel最大列数
+                    "step": 1
+                }),
+                "layout": (["row", "column", "range"], {
+                    "default": "range",
+                    "label": "写入方式"
+                }),
+                "append_mode": ("BOOLEAN", {
+                    "default": False,
+                    "label": "追加到下一空行"
+                }),
+            },
+            "optional": {
+                "write_behind": ("BOOLEAN", {
+                    "default": False,
+                    "label": "缓存工作簿并延迟保存"
+                }),
+                "flush_delay_seconds": ("FLOAT", {
+                    "default": _WorkbookCache.FLUSH_DELAY,
+                    "min": 0.0,
+                    "max": 3600.0,
+                    "step": 0.5,
+                    "label": "空闲多少秒后保存"
+                }),
+                "flush_after_cells": ("INT", {
+                    "default": _WorkbookCache.FLUSH_AFTER_CELLS,
+                    "min": 1,
+                    "max": 1000000,
+                    "step": 1,
+                    "label": "累计多少个单元格后保存"
+                }),
+                "backend": (TABLE_BACKENDS, {
+                    "default": "xlsx",
+                    "label": "存储格式"
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("INT", "INT", "INT")
+    RETURN_NAMES = ("start_row", "end_row", "cell_count")
+    FUNCTION = "save_table"
+    CATEGORY = "JT/text"
+    INPUT_IS_LIST = True
+
+    def _build_cells(self, texts: list, layout: str, column: int) -> list:
+        """将文本列表转换为相对起始行的 (行偏移, 列, 值) 列表"""
+        lines = [line for text in texts for line in str(text).splitlines()]
+        if layout == "range":
+            return [(r, column + c, value)
+                    for r, line in enumerate(lines)
+                    for c, value in enumerate(line.split('\t'))]
+        values = [value for line in lines for value in line.split('\t')]
+        if layout == "row":
+            return [(0, column + c, value) for c, value in enumerate(values)]
+        return [(r, column, value) for r, value in enumerate(values)]
+
+    def save_table(self, text: list, folder_path: list, filename: list, sheet_name: list,
+                   row: list, column: list, layout: list, append_mode: list,
+                   write_behind: list = None, backend: list = None, flush_delay_seconds: list = None,
+                   flush_after_cells: list = None) -> tuple[int, int, int]:
+        """批量写入Excel表格
+
+        Args:
+            text: 文本列表(或多行/Tab分隔文本)
+            folder_path: 保存目录
+            filename: 文件名(可带扩展名)
+            sheet_name: 工作表名
+            row: 起始行号(追加模式下忽略)
+            column: 起始列号
+            layout: 写入方式(row/column/range)
+            append_mode: 是否从下一空行开始写入
+            write_behind: 是否使用 JT Save Text to Excel 的工作簿缓存延迟保存
+            backend: 存储格式，xlsx或sqlite（sqlite模式下一个事务写入全部单元格）
+            flush_delay_seconds: 延迟保存模式下空闲多少秒后保存
+            flush_after_cells: 延迟保存模式下累计多少个未保存单元格后立即保存
+
+        Returns:
+            tuple: (起始行号, 结束行号, 写入单元格数)
+        """
+        # INPUT_IS_LIST模式下，除文本外的参数取第一个值
+        folder_path, filename, sheet_name = folder_path[0], filename[0], sheet_name[0]
+        row, column, layout, append_mode = row[0], column[0], layout[0], append_mode[0]
+        write_behind = bool(write_behind and write_behind[0])
+        backend = backend[0] if backend else "xlsx"
+        flush_delay_seconds = flush_delay_seconds[0] if flush_delay_seconds else _WorkbookCache.FLUSH_DELAY
+        flush_after_cells = flush_after_cells[0] if flush_after_cells else _WorkbookCache.FLUSH_AFTER_CELLS
+
+        save_path = Path(folder_path)
+        save_path.mkdir(parents=True, exist_ok=True)
+        try:
+            if not any(filename.endswith(ext) for ext in ['.xlsx', '.xls']):
+                filename = f"{filename}.xlsx"
+            file_path = save_path / filename
+
+            cells = self._build_cells(text, layout, column)
+            if not cells:
+                return (row, row - 1, 0)
+            row_count = max(r for r, _, _ in cells) + 1
+
+            if backend == "sqlite":
+                base_row = _SqliteTable.write_cells(
+                    _SqliteTable.path_for(save_path, filename), sheet_name,
+                    [(r + (0 if append_mode else row), c, v) for r, c, v in cells], append=append_mode
+                )
+                start_row = base_row if append_mode else row
+                return (start_row, start_row + row_count - 1, len(cells))
+
+            if write_behind:
+                base_row = _WorkbookCache.write(
+                    file_path, sheet_name, [(r + (0 if append_mode else row), c, v) for r, c, v in cells],
+                    flush_delay_seconds, flush_after_cells, append=append_mode
+                )
+                start_row = base_row if append_mode else row
+                return (start_row, start_row + row_count - 1, len(cells))
+
+            # 直接保存前先写出该文件缓存中的单元格
+            _WorkbookCache.flush(file_path, discard=True)
+            wb = openpyxl.load_workbook(file_path) if file_path.exists() else Workbook()
+            ws = _get_or_create_sheet(wb, sheet_name)
+
+            start_row = row
+            key = (os.path.abspath(file_path), sheet_name)
+            if append_mode:
+                state, next_row = self._next_rows.pop(key, (None, None))
+                if state is None or state != _file_state(file_path):
+                    next_row = _last_used_row(ws) + 1  # 文件已变化，记录失效
+                start_row = next_row
+
+            for r, c, value in cells:
+                ws.cell(row=start_row + r, column=c, value=value)
+            wb.save(file_path)
+
+            # 记录保存后的文件状态与下一空行，文件未被修改时下次追加直接使用
+            if append_mode:
+                self._next_rows[key] = (_file_state(file_path), start_row + row_count)
+                while len(self._next_rows) > self.MAX_NEXT_ROWS:
+                    self._next_rows.popitem(last=False)
+
+        except Exception as e:
+            raise RuntimeError(f"保存Excel文件时出错: {str(e)}")
+
+        return (start_row, start_row + row_count - 1, len(cells))
+
+class JTFlushExcelWrites:
+    """Excel延迟保存落盘节点
+
+    立即保存 JT Save Text to Excel 延迟保存模式下缓存的单元格。
+
+    Attributes:
+        RETURN_TYPES (tuple): 定义输出类型
+        FUNCTION (str): 处理函数名
+        CATEGORY (str): 节点分类
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {},
+            "optional": {
+                "text": ("STRING", {
+                    "forceInput": True
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "INT")
+    RETURN_NAMES = ("text", "flushed_cells")
+    FUNCTION = "flush"
+    CATEGORY = "JT/text"
+    OUTPUT_NODE = True
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # 每次执行都需要保存缓存
+        return float("nan")
+
+    def flush(self, text=None) -> tuple:
+        """保存所有缓存的工作簿
+
+        Args:
+            text: 透传的文本，连接保存节点的输出以保证执行顺序
+        """
+        try:
+            count = _WorkbookCache.flush()
+        except Exception as e:
+            raise RuntimeError(f"保存Excel文件时出错: {str(e)}")
+        return (text or "", count)
+
+EXCEL_CACHE_MB_ENV = "JT_EXCEL_CACHE_MB"
+EXCEL_SIDECAR_ENV = "JT_EXCEL_SIDECAR"
+EXCEL_SIDECAR_DIR = ".jt_excel_cache"
+EXCEL_SIDECAR_VERSION = 2
+_SIDECAR_TYPES = (type(None), str, int, float, bool)
+
+def _open_sheet(wb, sheet_name: str = None):
+    """返回指定名称的工作表，未指定时返回活动工作表"""
+    return wb[sheet_name] if sheet_name else wb.active
+
+def _row_size(values: tuple) -> int:
+    """估算一行单元格值占用的内存（字节）"""
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values if value is not None)
+
+EXCEL_MATCH_MODES = ["exact", "case_insensitive", "prefix", "contains"]
+
+class _SheetFindIndex:
+    """
+    Lookup index over one column (or all columns) of a parsed sheet for one match mode.
+
+    Distinct cell texts are numbered in order of first occurrence (row-major), so the
+    smallest matching key number is always the first matching cell:
+      - exact / case_insensitive: hash map text -> key number
+      - prefix: keys sorted for bisect range queries, with per-block minima of the
+        key numbers so the first match in a range is found without visiting every key
+      - contains: the distinct texts are scanned in order until INDEX_AFTER_SCANS
+        queries have been scanned; then a trigram -> ascending key numbers index is
+        built, candidates from the rarest trigram are verified in order and the first
+        verified key wins. Texts longer than MAX_GRAM_KEY characters are not indexed
+        and are scanned after the candidates; queries shorter than 3 characters always
+        scan. If the postings would exceed max_bytes, the index is dropped while
+        building and every query keeps scanning.
+    Query results are memoized, so repeated lookups are O(1).
+    """
+
+    BLOCK = 256
+    MAX_RESULTS = 4096
+    INDEX_AFTER_SCANS = 64  # contains模式下扫描多少次不同的查询后建立三字符组索引
+    MAX_GRAM_KEY = 64  # 超过该长度的文本不建立三字符组索引
+    GRAM_BYTES = 160  # 三字符组索引每个新片段的估算内存（字符串、字典项与列表）
+    POSTING_BYTES = 8
+
+    def __init__(self, rows: list, column: int, mode: str, max_bytes: int = None):
+        self.mode = mode
+        self.keys = []  # 按首次出现顺序排列的不同文本
+        self.positions = []  # 每个文本第一次出现的 (行, 列)
+        self.results = {}  # 查询文本 -> 键序号，缓存查询结果
+        ids = {}
+        for row, values in enumerate(rows, 1):
+            if column == 0:
+                cells = enumerate(values, 1)
+            else:
+                cells = ((column, values[column - 1]),) if column <= len(values) else ()
+            for col, value in cells:
+                if value:
+                    key = self.normalize(mode, str(value))
+                    if key not in ids:
+                        ids[key] = len(self.keys)
+                        self.keys.append(key)
+                        self.positions.append((row, col))
+
+        self.nbytes = len(self.keys) * 150
+        if mode in ("exact", "case_insensitive"):
+            self.ids = ids
+        elif mode == "prefix":
+            self.order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+            self.sorted_keys = [self.keys[i] for i in self.order]
+            self.block_min = [min(self.order[i:i + self.BLOCK])
+                              for i in range(0, len(self.order), self.BLOCK)]
+            self.nbytes += len(self.keys) * 16
+        else:
+            self.max_bytes = max_bytes
+            self.grams = None  # 三字符组 -> 键序号列表，建立前或超过内存预算时为None
+            self.long_keys = []  # 未建立索引的长文本键序号（升序）
+            self.scans = 0
+
+    def _build_grams(self):
+        """建立三字符组索引，超过内存预算时放弃（之后的查找继续扫描）"""
+        self.scans = -1  # 只尝试一次
+        grams, long_keys, gram_bytes = {}, [], 0
+        for i, key in enumerate(self.keys):
+            if len(key) > self.MAX_GRAM_KEY:
+                long_keys.append(i)
+                continue
+            for gram in {key[j:j + 3] for j in range(len(key) - 2)}:
+                postings = grams.get(gram)
+                if postings is None:
+                    postings = grams[gram] = []
+                    gram_bytes += self.GRAM_BYTES
+                postings.append(i)
+                gram_bytes += self.POSTING_BYTES
+            if self.max_bytes is not None and gram_bytes > self.max_bytes:
+                return
+        self.grams, self.long_keys = grams, long_keys
+        self.nbytes += gram_bytes + len(long_keys) * 8
+
+    @staticmethod
+    def normalize(mode: str, text: str) -> str:
+        return text.casefold() if mode == "case_insensitive" else text
+
+    @staticmethod
+    def matches(mode: str, text: str, value) -> bool:
+        """单元格值是否匹配（用于不缓存时的流式查找）"""
+        if not value or not text:
+            return False
+        value = str(value)
+        if mode == "exact":
+            return value == text
+        if mode == "case_insensitive":
+            return value.casefold() == text.casefold()
+        if mode == "prefix":
+            return value.startswith(text)
+        return text in value
+
+    def _range_min(self, lo: int, hi: int):
+        """order[lo:hi] 中最小的键序号"""
+        best = None
+        while lo < hi:
+            if lo % self.BLOCK == 0 and lo + self.BLOCK <= hi:
+                candidate = self.block_min[lo // self.BLOCK]
+                lo += self.BLOCK
+            else:
+                candidate = self.order[lo]
+                lo += 1
+            if best is None or candidate < best:
+                best = candidate
+        return best
+
+    def _prefix_end(self, text: str) -> int:
+        """以text开头的键在sorted_keys中的结束位置"""
+        successor = _prefix_successor(text)
+        return bisect.bisect_left(self.sorted_keys, successor) if successor else len(self.sorted_keys)
+
+    def _lookup(self, text: str):
+        if self.mode in ("exact", "case_insensitive"):
+            return self.ids.get(self.normalize(self.mode, text))
+        if self.mode == "prefix":
+            lo = bisect.bisect_left(self.sorted_keys, text)
+            return self._range_min(lo, self._prefix_end(text))
+        if self.grams is None and len(text) >= 3 and self.scans >= 0:
+            self.scans += 1
+            if self.scans > self.INDEX_AFTER_SCANS:
+                self._build_grams()
+        if len(text) < 3 or self.grams is None:
+            return next((i for i, key in enumerate(self.keys) if text in key), None)
+        postings = [self.grams.get(text[j:j + 3], ()) for j in range(len(text) - 2)]
+        best = next((i for i in min(postings, key=len) if text in self.keys[i]), None)
+        # 未建立索引的长文本按顺序扫描到已找到的位置为止
+        for i in self.long_keys:
+            if best is not None and i > best:
+                break
+            if text in self.keys[i]:
+                return i
+        return best
+
+    def find(self, text: str):
+        """返回第一个匹配单元格的 (行, 列)，未找到时返回None"""
+        if not text:
+            return None
+        if text not in self.results:
+            if len(self.results) >= self.MAX_RESULTS:
+                self.results.clear()
+            self.results[text] = self._lookup(text)
+        key_id = self.results[text]
+        return self.positions[key_id] if key_id is not None else None
+
+class _SheetSidecar:
+    """
+    Marshal sidecar file with the parsed values of one sheet, stored in
+    ".jt_excel_cache/" next to the workbook.
+
+    Layout: the 8-byte offset of the footer, the rows as marshal chunks of CHUNK_ROWS
+    value tuples, then the footer {version, sheet, state, dimension, nbytes, rows,
+    chunk_rows, offsets}. Rows are written and read one chunk at a time, so neither
+    side depends on the in-memory cache cap, and the chunk offsets allow reading from
+    any row without loading the rows before it. The file is written under a temporary
+    name and renamed when complete.
+    """
+
+    CHUNK_ROWS = 1024
+    _OFFSET = struct.Struct("<Q")
+
+    def __init__(self, file_path: Path, sheet_name: str = None):
+        sheet_hash = hashlib.sha1((sheet_name or "").encode("utf-8")).hexdigest()[:12]
+        self.path = Path(file_path).parent / EXCEL_SIDECAR_DIR / f"{Path(file_path).name}.{sheet_hash}.marshal"
+        self.sheet_name = sheet_name
+
+    def read_footer(self, state):
+        """读取文件尾信息，文件不存在或与工作簿当前版本不一致时返回None"""
+        try:
+            with open(self.path, "rb") as f:
+                offset, = self._OFFSET.unpack(f.read(self._OFFSET.size))
+                f.seek(offset)
+                footer = marshal.load(f)
+            if (footer.get("version") != EXCEL_SIDECAR_VERSION or footer.get("sheet") != self.sheet_name
+                    or tuple(footer.get("state", ())) != state):
+                return None
+            footer["dimension"] = tuple(footer["dimension"])
+            return footer
+        except (OSError, ValueError, EOFError, TypeError, AttributeError, KeyError, struct.error):
+            return None
+
+    def iter_rows(self, footer: dict, start: int = 0):
+        """从第start行（0起）开始逐块读取各行的值元组"""
+        chunk, skip = divmod(start, footer["chunk_rows"])
+        offsets = footer["offsets"]
+        if chunk >= len(offsets):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offsets[chunk])
+            for _ in range(chunk, len(offsets)):
+                yield from itertools.islice(marshal.load(f), skip, None)
+                skip = 0
+
+    def write(self, state, rows, dimension: tuple = None):
+        """把行迭代器逐块写入文件，返回文件尾信息；存在无法等价保存的值时不写入并返回None"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，避免其他进程读到不完整的内容
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        chunk, offsets = [], []
+        count = nbytes = used_rows = max_columns = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self._OFFSET.pack(0))
+                for values in rows:
+                    count += 1
+                    nbytes += _row_size(values)
+                    if values:
+                        used_rows = count
+                        max_columns = max(max_columns, len(values))
+                    if not all(type(value) in _SIDECAR_TYPES for value in values):
+                        # 日期等类型按文本保存，str()结果不变；值为假时无法等价保存，放弃写入
+                        if not all(value or type(value) in _SIDECAR_TYPES for value in values):
+                            return None
+                        values = tuple(value if type(value) in _SIDECAR_TYPES else str(value) for value in values)
+                    chunk.append(values)
+                    if len(chunk) == self.CHUNK_ROWS:
+                        offsets.append(f.tell())
+                        marshal.dump(chunk, f)
+                        chunk.clear()
+                if chunk:
+                    offsets.append(f.tell())
+                    marshal.dump(chunk, f)
+                footer = {
+                    "version": EXCEL_SIDECAR_VERSION,
+                    "sheet": self.sheet_name,
+                    "state": state,
+                    "dimension": dimension or (used_rows, max_columns),
+                    "nbytes": nbytes,
+                    "rows": count,
+                    "chunk_rows": self.CHUNK_ROWS,
+                    "offsets": offsets,
+                }
+                offset = f.tell()
+                marshal.dump(footer, f)
+                f.seek(0)
+                f.write(self._OFFSET.pack(offset))
+            os.replace(tmp_path, self.path)
+            footer["dimension"] = tuple(footer["dimension"])
+            return footer
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+class _SheetTooLarge(Exception):
+    """工作表超过解析缓存上限"""
+
+class _SheetCache:
+    """
+    Process-level LRU cache of parsed sheet values shared by the Excel reader nodes.
+
+    Rows are streamed in read-only mode (values only, no cell objects) and kept as
+    tuples of the raw cell values, so str() and truthiness behave exactly like
+    reading the cells directly. Sheets are parsed incrementally: a read or lookup
+    only parses as far as it needs and later calls resume after the last parsed row.
+
+    Find lookups use a text -> first (row, column) index built over the parsed rows
+    in row-major order; only truthy values are indexed, matching the original
+    `cell.value and str(cell.value) == Find_Text` test.
+
+    Entries are keyed by (path, sheet, mtime, size). The total size is capped
+    (JT_EXCEL_CACHE_MB, default 512, or set_excel_cache_limit()) with LRU eviction;
+    a sheet that alone exceeds the cap is not cached and is streamed on every call.
+
+    After a repeated read of the same file state, one background thread per (path,
+    sheet) streams the whole sheet into a _SheetSidecar file, whatever its size. While the workbook's mtime and size are
+    unchanged, rows are then read from the sidecar instead of parsing the xlsx, both
+    when filling the cache (within the cap) and when streaming an oversized sheet;
+    later processes use it as well. Set JT_EXCEL_SIDECAR=0 to disable.
+    """
+
+    CHECK_ROWS = 1024  # 每解析多少行统计一次内存
+    INDEX_ENTRY_BYTES = 100  # 查找索引每个条目的估算内存
+    MAX_OVERSIZE = 64
+    MATERIALIZE_AFTER_READS = 2  # 同一文件状态读取几次后才生成旁路缓存文件
+
+    max_bytes = int(float(os.environ.get(EXCEL_CACHE_MB_ENV, "512")) * 1024 * 1024)
+    use_sidecar = os.environ.get(EXCEL_SIDECAR_ENV, "1") != "0"
+    hits = 0
+    misses = 0
+    sidecar_loads = 0
+
+    _bytes = 0
+    _entries = OrderedDict()  # (绝对路径, 工作表) -> 缓存项
+    _oversize = OrderedDict()  # (绝对路径, 工作表, 文件状态) -> 不保留数据的缓存项，超过上限不缓存的工作表
+    _materializing = set()  # 正在生成旁路缓存文件的 (绝对路径, 工作表)
+    _lock = threading.Lock()
+
+    def __init__(self, key: tuple, file_path: Path, sheet_name: str, state):
+        self.key = key
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.state = state
+        self.rows = []  # 已解析各行的值元组
+        self.complete = False  # 是否已解析到工作表末尾
+        self.dimension = None  # (最大行, 最大列)
+        self.positions = {}  # 文本 -> (行, 列)，全部列精确匹配的逐步索引
+        self.indexed_rows = 0
+        self.indexes = {}  # (关键列, 匹配方式) -> _SheetFindIndex
+        self.nbytes = 0
+        self.pending_bytes = 0  # 尚未计入缓存总量的内存
+        self.lock = threading.Lock()
+        self.sidecar = _SheetSidecar(file_path, sheet_name) if self.use_sidecar else None
+        self.footer = None  # 与当前版本一致的旁路缓存文件尾信息，存在时从该文件读取各行
+        self.prepared = False  # 是否已检查旁路缓存文件
+        self.sidecar_done = not self.use_sidecar  # 旁路缓存文件已存在、已开始写入或无法写入
+        self.reads = 0  # 当前文件状态的读取次数
+
+    @classmethod
+    def _get(cls, file_path: Path, sheet_name: str = None):
+        """获取工作表当前版本的缓存项，工作表超过缓存上限时返回None"""
+        key = (os.path.abspath(file_path), sheet_name)
+        state = _file_state(file_path)
+        if state is None:
+            raise FileNotFoundError(f"No such file: '{file_path}'")
+        with cls._lock:
+            if key + (state,) in cls._oversize:
+                return None
+            entry = cls._entries.get(key)
+            if entry is not None and entry.state == state:
+                cls._entries.move_to_end(key)
+                return entry
+            if entry is not None:
+                cls._remove(entry)
+            entry = cls(key, file_path, sheet_name, state)
+            cls._entries[key] = entry
+            return entry
+
+    @classmethod
+    def _remove(cls, entry: "_SheetCache"):
+        """移出缓存（调用方持有_lock）"""
+        if cls._entries.get(entry.key) is entry:
+            del cls._entries[entry.key]
+            cls._bytes -= entry.nbytes
+
+    def _flush_bytes(self):
+        """计入新增内存，超过上限时按LRU淘汰其他工作表；仍超过时不再缓存该工作表"""
+        cls = type(self)
+        nbytes, self.pending_bytes = self.pending_bytes, 0
+        with cls._lock:
+            self.nbytes += nbytes
+            if cls._entries.get(self.key) is not self:
+                return  # 已被淘汰，本次调用结束后释放
+            cls._bytes += nbytes
+            for other in list(cls._entries.values()):
+                if cls._bytes <= cls.max_bytes:
+                    break
+                if other is not self:
+                    cls._remove(other)
+            if cls._bytes > cls.max_bytes:
+                cls._remove(self)
+                detached = cls(self.key, self.file_path, self.sheet_name, self.state)
+                detached.reads, detached.sidecar_done = self.reads, self.sidecar_done
+                cls._oversize[self.key + (self.state,)] = detached
+                while len(cls._oversize) > cls.MAX_OVERSIZE:
+                    cls._oversize.popitem(last=False)
+                raise _SheetTooLarge()
+
+    def _index_rows(self, text: str = None) -> bool:
+        """把已解析但未索引的行加入查找索引，返回text是否已在索引中"""
+        positions = self.positions
+        count = len(positions)
+        for row in range(self.indexed_rows, len(self.rows)):
+            for column, value in enumerate(self.rows[row], 1):
+                if value:
+                    positions.setdefault(str(value), (row + 1, column))
+            self.indexed_rows = row + 1
+            if text is not None and text in positions:
+                break
+        self.pending_bytes += (len(positions) - count) * self.INDEX_ENTRY_BYTES
+        return text in positions
+
+    def _extend(self, max_row: int = None, text: str = None):
+        """从上次停止的行继续解析（有旁路缓存文件时从文件读取），到达max_row、找到text或工作表末尾时停止"""
+        wb = None
+        try:
+            if self.footer is not None:
+                rows = self.sidecar.iter_rows(self.footer, len(self.rows))
+            else:
+                wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+                ws = _open_sheet(wb, self.sheet_name)
+                if self.dimension is None and ws.max_row and ws.max_column:
+                    self.dimension = (ws.max_row, ws.max_column)
+                rows = ws.iter_rows(min_row=len(self.rows) + 1, values_only=True)
+            for values in rows:
+                self.rows.append(values)
+                self.pending_bytes += _row_size(values)
+                if len(self.rows) % self.CHECK_ROWS == 0:
+                    self._flush_bytes()
+                if max_row is not None and len(self.rows) >= max_row:
+                    break
+                if text is not None and self._index_rows(text):
+                    break
+            else:
+                self.complete = True
+        finally:
+            if wb is not None:
+                wb.close()
+        self._flush_bytes()
+
+    def _prepare(self):
+        """首次使用时检查旁路缓存文件，有效时之后的行都从该文件读取（调用方持有self.lock）"""
+        if self.prepared:
+            return
+        self.prepared = True
+        if self.sidecar_done:
+            return
+        footer = self.sidecar.read_footer(self.state)
+        if footer is None:
+            return
+        self.footer = footer
+        self.sidecar_done = True
+        if self.dimension is None:
+            self.dimension = footer["dimension"]
+        with self._lock:
+            type(self).sidecar_loads += 1
+
+    def _materialize(self):
+        """后台把整个工作表逐块写入旁路缓存文件
+
+        写入时只缓冲一个分块，与内存上限无关；写入后前台按需从该文件继续读取，不预先载入
+        """
+        try:
+            wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+            try:
+                ws = _open_sheet(wb, self.sheet_name)
+                dimension = (ws.max_row, ws.max_column) if ws.max_row and ws.max_column else None
+                footer = self.sidecar.write(self.state, ws.iter_rows(values_only=True), dimension)
+            finally:
+                wb.close()
+            if footer is None:
+                return
+            if _file_state(self.file_path) != self.state:
+                self.sidecar.path.unlink(missing_ok=True)  # 写入期间工作簿已变化
+                return
+
+            with self.lock:
+                if self.footer is None:
+                    self.footer = footer
+                if self.dimension is None:
+                    self.dimension = footer["dimension"]
+        except Exception as e:
+            print(f"[JTnodes] 写入Excel缓存文件失败 {self.file_path}: {e}")
+        finally:
+            with self._lock:
+                type(self)._materializing.discard(self.key)
+
+    def _schedule_materialize(self):
+        """同一文件状态重复读取后在后台生成旁路缓存文件，每个 (路径, 工作表) 同时只有一个写入线程"""
+        cls = type(self)
+        with cls._lock:
+            self.reads += 1
+            if self.sidecar_done or self.reads < self.MATERIALIZE_AFTER_READS or self.key in cls._materializing:
+                return
+            cls._materializing.add(self.key)
+            self.sidecar_done = True
+        threading.Thread(target=self._materialize, name="JTExcelSidecar", daemon=True).start()
+
+    def _get_dimension(self) -> tuple:
+        """工作表的 (最大行, 最大列)，未保存尺寸时解析整个工作表计算"""
+        if self.dimension is None and not self.rows and not self.complete:
+            self._extend(max_row=1)
+        if self.dimension is None:
+            if not self.complete:
+                self._extend()
+            used = [row for row, values in enumerate(self.rows, 1) if values]
+            self.dimension = (used[-1] if used else 0,
+                              max((len(values) for values in self.rows), default=0))
+        return self.dimension
+
+    @classmethod
+    def _count(cls, hit: bool):
+        with cls._lock:
+            if hit:
+                cls.hits += 1
+            else:
+                cls.misses += 1
+
+    @classmethod
+    def _stream_sidecar(cls, file_path: Path, sheet_name: str = None) -> tuple:
+        """不缓存的工作表优先从有效的旁路缓存文件流式读取，返回 (旁路缓存文件, 文件尾信息或None)"""
+        if not cls.use_sidecar:
+            return None, None
+        state = _file_state(file_path)
+        sidecar = _SheetSidecar(file_path, sheet_name)
+        footer = sidecar.read_footer(state)
+        if footer is None:
+            with cls._lock:
+                entry = cls._oversize.get((os.path.abspath(file_path), sheet_name, state))
+            if entry is not None:
+                entry._schedule_materialize()
+        return sidecar, footer
+
+    @classmethod
+    def cell_value(cls, file_path: Path, sheet_name: str, row: int, column: int):
+        """读取单元格的值，超出工作表范围时抛出ValueError"""
+        entry = cls._get(file_path, sheet_name)
+        if entry is not None:
+            try:
+                with entry.lock:
+                    entry._prepare()
+                    parsed = len(entry.rows)
+                    max_row, max_column = entry._get_dimension()
+                    if row > max_row:
+                        raise ValueError(f"Row number {row} exceeds maximum row {max_row}")
+                    if column > max_column:
+                        raise ValueError(f"Column number {column} exceeds maximum column {max_column}")
+                    if row > len(entry.rows) and not entry.complete:
+                        entry._extend(max_row=row)
+                    hit = len(entry.rows) == parsed
+                    values = entry.rows[row - 1] if row <= len(entry.rows) else ()
+                cls._count(hit)
+                entry._schedule_materialize()
+                return values[column - 1] if column <= len(values) else None
+            except _SheetTooLarge:
+                pass
+
+        cls._count(False)
+        sidecar, footer = cls._stream_sidecar(file_path, sheet_name)
+        if footer is not None:
+            max_row, max_column = footer["dimension"]
+            if row > max_row:
+                raise ValueError(f"Row number {row} exceeds maximum row {max_row}")
+            if column > max_column:
+                raise ValueError(f"Column number {column} exceeds maximum column {max_column}")
+            values = next(sidecar.iter_rows(footer, row - 1), ())
+            return values[column - 1] if column <= len(values) else None
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = _open_sheet(wb, sheet_name)
+            if not ws.max_row or not ws.max_column:
+                ws.calculate_dimension(force=True)
+            if row > ws.max_row:
+                raise ValueError(f"Row number {row} exceeds maximum row {ws.max_row}")
+            if column > ws.max_column:
+                raise ValueError(f"Column number {column} exceeds maximum column {ws.max_column}")
+            return next(ws.iter_rows(min_row=row, max_row=row, min_col=column, max_col=column,
+                                     values_only=True))[0]
+        finally:
+            wb.close()
+
+    def _find(self, text: str, key_column: int, match_mode: str):
+        """在缓存的工作表中查找，返回 ((行, 列) 或 None, 是否命中缓存)"""
+        if key_column == 0 and match_mode == "exact":
+            # 全部列精确匹配：逐步解析，找到即停止
+            hit = self._index_rows(text) or self.complete
+            if not hit:
+                self._extend(text=text)
+            self._flush_bytes()
+            return self.positions.get(text), hit
+
+        index = self.indexes.get((key_column, match_mode))
+        hit = index is not None
+        if index is None:
+            if not self.complete:
+                self._extend()
+            # 索引可用的内存不超过缓存上限中除本工作表以外的部分（其他工作表可被淘汰）
+            budget = max(self.max_bytes - self.nbytes - self.pending_bytes, 0)
+            index = _SheetFindIndex(self.rows, key_column, match_mode, budget)
+            self.indexes[(key_column, match_mode)] = index
+            self.pending_bytes += index.nbytes
+            self._flush_bytes()
+        nbytes = index.nbytes
+        position = index.find(text)
+        if index.nbytes != nbytes:  # contains索引在查找时才建立
+            self.pending_bytes += index.nbytes - nbytes
+            self._flush_bytes()
+        return position, hit
+
+    @classmethod
+    def find_text(cls, file_path: Path, sheet_name: str, text: str, output_column: int,
+                  key_column: int = 0, match_mode: str = "exact") -> tuple[str, int, int]:
+        """查找第一个匹配的单元格（行优先），返回 (输出列文本, 行号, 列号)，未找到时为 ("", 0, 0)
+
+        key_column为0时查找全部列
+        """
+        position = values = None
+        entry = cls._get(file_path, sheet_name)
+        if entry is not None:
+            try:
+                with entry.lock:
+                    entry._prepare()
+                    position, hit = entry._find(text, key_column, match_mode)
+                    if position is not None:
+                        values = entry.rows[position[0] - 1]
+                cls._count(hit)
+                entry._schedule_materialize()
+            except _SheetTooLarge:
+                entry = None
+
+        if entry is None:
+            # 不缓存的工作表逐行流式查找，找到即停止
+            cls._count(False)
+            sidecar, footer = cls._stream_sidecar(file_path, sheet_name)
+            wb = None
+            try:
+                if footer is not None:
+                    rows = sidecar.iter_rows(footer)
+                else:
+                    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+                    rows = _open_sheet(wb, sheet_name).iter_rows(values_only=True)
+                for row, row_values in enumerate(rows, 1):
+                    cells = (enumerate(row_values, 1) if key_column == 0 else
+                             [(key_column, row_values[key_column - 1])] if key_column <= len(row_values) else [])
+                    column = next((column for column, value in cells
+                                   if _SheetFindIndex.matches(match_mode, text, value)), None)
+                    if column is not None:
+                        position, values = (row, column), row_values
+                        break
+            finally:
+                if wb is not None:
+                    wb.close()
+
+        if position is None:
+            return ("", 0, 0)
+        value = values[output_column - 1] if output_column <= len(values) else None
+        return (str(value) if value is not None else "", position[0], position[1])
+
+    @classmethod
+    def set_max_bytes(cls, max_bytes: int):
+        """设置缓存上限并按LRU淘汰超出的工作表"""
+        with cls._lock:
+            cls.max_bytes = max_bytes
+            cls._oversize.clear()
+            while cls._entries and cls._bytes > cls.max_bytes:
+                cls._remove(next(iter(cls._entries.values())))
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            return {
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "sidecar_loads": cls.sidecar_loads,
+                "sheets": len(cls._entries),
+                "bytes": cls._bytes,
+                "max_bytes": cls.max_bytes,
+            }
+
+def get_excel_cache_stats() -> dict:
     """
-    
+    Return hit/miss counters and memory usage of the shared Excel sheet cache
+    used by JT Read From Excel and JT Find Text From Excel.
+    """
+    return _SheetCache.stats()
+
+def set_excel_cache_limit(max_mb: float):
+    """Set the memory cap (in MB) of the shared Excel sheet cache."""
+    _SheetCache.set_max_bytes(int(max_mb * 1024 * 1024))
+
+class JTExcelCacheStats:
+    """Excel读取缓存统计节点，输出共享工作表缓存的命中/未命中次数和内存占用"""
+
     @classmethod
     def INPUT_TYPES(cls):
         return {
-            "required": {
+            "required": {},
+            "optional": {
                 "text": ("STRING", {
-                    "default": "",
-                    "multiline": True
-                }),
-                "folder_path": ("STRING", {
-                    "default": "/path",
-                    "multiline": False
-                }),
-                "filename": ("STRING", {
-                    "default": "output",
-                    "multiline": False
-                }),
-                "sheet_name": ("STRING", {
-                    "default": "Sheet1",
-                    "multiline": False
-                }),
-                "row": ("INT", {
-                    "default": 1,
-                    "min": 1,
-                    "max": 1048576,  # Excel最大行数
-                    "step": 1
+                    "forceInput": True
                 }),
-                "column": ("INT", {
-                    "default": 1,
-                    "min": 1,
-                    "max": 16384,  # Excel最大列数
-                    "step": 1
-                })
             },
         }
-    
-    RETURN_TYPES = ("STRING",)
-    FUNCTION = "save_to_excel"
+
+    RETURN_TYPES = ("STRING", "STRING", "INT", "INT")
+    RETURN_NAMES = ("text", "stats", "hits", "misses")
+    FUNCTION = "get_stats"
     CATEGORY = "JT/text"
+    OUTPUT_NODE = True
 
-    def save_to_excel(self, text: str, folder_path: str, filename: str,
-                     sheet_name: str, row: int, column: int) -> tuple[str]:
-        """保存文本到Excel表格
-        
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return float("nan")
+
+    def get_stats(self, text: str = "") -> tuple[str, str, int, int]:
+        """
         Args:
-            text: 文本内容
-            folder_path: 保存目录
-            filename: 文件名(可带扩展名)
-            sheet_name: 工作表名
-            row: 起始行号
-            column: 起始列号
+            text: 透传的文本，连接读取节点的输出以保证执行顺序
+
+        Returns:
+            tuple: (透传的文本, JSON格式的统计, 命中次数, 未命中次数)
         """
-        # 创建保存目录
-        save_path = Path(folder_path)
-        save_path.mkdir(parents=True, exist_ok=True)
-        
-        # 处理文件名
-        try:
-            # 处理文件扩展名
-            if not any(filename.endswith(ext) for ext in ['.xlsx', '.xls']):
-                filename = f"{filename}.xlsx"
-            
-            # 完整文件路径
-            file_path = save_path / filename
-            
-            # 获取或创建工作簿
-            wb = openpyxl.load_workbook(file_path) if file_path.exists() else Workbook()
-            
-            # 获取或创建工作表
-            if sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
-            else:
-                ws = wb.create_sheet(sheet_name)
-                # 如果是默认的Sheet且不是目标工作表，删除它
-                if "Sheet" in wb.sheetnames and sheet_name != "Sheet":
-                    wb.remove(wb["Sheet"])
-            
-            # 处理文本内容（如果有多行，只取第一行）
-            first_line = text.split('\n')[0] if text else ""
-            
-            # 写入文本内容
-            ws.cell(row=row, column=column, value=first_line)
-            
-            # 保存文件
-            wb.save(file_path)
-            
-        except Exception as e:
-            raise RuntimeError(f"保存Excel文件时出错: {str(e)}")
-        
-        # 返回实际保存的内容
-        return (first_line,)
+        stats = get_excel_cache_stats()
+        return (text, json.dumps(stats), stats["hits"], stats["misses"])
 
 class JTFindTextFromExcel:
     """Find specified text in Excel file and return related information
@@ -475,10 +3176,13 @@ class JTFindTextFromExcel:
         - Find specified text in Excel file
         - Return text from specified column in the same row
         - Return row and column numbers of found text
+        - Optional sheet name, key column and match mode (exact, case_insensitive, prefix, contains)
         
     Notes:
         - Automatically handles Excel file extension (.xlsx)
         - Creates directory if not exists
+        - Sheet values and a value index are kept in a shared cache (see _SheetCache);
+          the sheet is streamed in read-only mode and parsing stops at the first match
     """
     
     @classmethod
@@ -513,6 +3217,33 @@ class JTFindTextFromExcel:
                     "round": True
                 }),
             },
+            "optional": {
+                "Sheet_Name": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "label": "Sheet_Name (empty = active sheet)"
+                }),
+                "Key_Column": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 16384,  # Excel max column number
+                    "step": 1,
+                    "label": "Key_Column (0 = all columns)",
+                    "round": True
+                }),
+                "Match_Mode": (EXCEL_MATCH_MODES, {
+                    "default": "exact",
+                    "label": "Match_Mode"
+                }),
+                "Backend": (TABLE_BACKENDS, {
+                    "default": "xlsx",
+                    "label": "Backend"
+                }),
+                "Content_Hash": ("BOOLEAN", {
+                    "default": False,
+                    "label": "Detect changes by content hash"
+                }),
+            },
         }
     
     RETURN_TYPES = ("STRING", "INT", "INT")
@@ -520,7 +3251,15 @@ class JTFindTextFromExcel:
     FUNCTION = "find_in_excel"
     CATEGORY = "JT/text"
 
-    def find_in_excel(self, Excel_Filepath: str, Excel_Filename: str, Find_Text: str, Output_Column: int) -> tuple[str, int, int]:
+    @classmethod
+    def IS_CHANGED(cls, Excel_Filepath: str = None, Excel_Filename: str = None, Backend: str = "xlsx",
+                   Content_Hash: bool = False, **kwargs):
+        # Re-run only when the table file changed (path, mtime, size, optional content hash)
+        return _table_fingerprint(Excel_Filepath, Excel_Filename, Backend, Content_Hash)
+
+    def find_in_excel(self, Excel_Filepath: str, Excel_Filename: str, Find_Text: str, Output_Column: int,
+                      Sheet_Name: str = "", Key_Column: int = 0, Match_Mode: str = "exact",
+                      Backend: str = "xlsx", Content_Hash: bool = False) -> tuple[str, int, int]:
         """Find text in Excel file
         
         Args:
@@ -528,6 +3267,11 @@ class JTFindTextFromExcel:
             Excel_Filename: Excel file name
             Find_Text: Text to search for
             Output_Column: Column number to output text from
+            Sheet_Name: Sheet to search, empty for the active sheet
+            Key_Column: Only search this column, 0 for all columns
+            Match_Mode: exact, case_insensitive, prefix or contains
+            Backend: xlsx, or sqlite to search the table written with backend="sqlite"
+            Content_Hash: Also hash the file content in IS_CHANGED
             
         Returns:
             tuple: (found text, row number, column number)
@@ -542,34 +3286,20 @@ class JTFindTextFromExcel:
             if not any(Excel_Filename.endswith(ext) for ext in ['.xlsx', '.xls']):
                 Excel_Filename = f"{Excel_Filename}.xlsx"
                 
+            # SQLite table: indexed query
+            if Backend == "sqlite":
+                return _SqliteTable.find_text(_SqliteTable.path_for(file_dir, Excel_Filename), Sheet_Name or None,
+                                              Find_Text, Output_Column, Key_Column, Match_Mode)
+                
             # Full file path
             file_path = file_dir / Excel_Filename
+
+            # Save pending write-behind cells first
+            _WorkbookCache.flush(file_path)
             
-            # Load Excel file
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            ws = wb.active
-            
-            # Search text in cells
-            found_text = ""
-            row_number = 0
-            column_number = 0
-            
-            for row in range(1, ws.max_row + 1):
-                for col in range(1, ws.max_column + 1):
-                    cell = ws.cell(row=row, column=col)
-                    if cell.value and str(cell.value) == Find_Text:
-                        # Get found position
-                        row_number = row
-                        column_number = col
-                        # Get text from output column
-                        output_cell = ws.cell(row=row, column=Output_Column)
-                        found_text = str(output_cell.value) if output_cell.value is not None else ""
-                        break
-                if row_number > 0:  # Stop searching if found
-                    break
-            
-            wb.close()
-            return (found_text, row_number, column_number)
+            # Look up first match (row-major) in shared sheet cache
+            return _SheetCache.find_text(file_path, Sheet_Name or None, Find_Text, Output_Column,
+                                         Key_Column, Match_Mode)
             
         except Exception as e:
             raise RuntimeError(f"Error processing Excel file: {str(e)}")
@@ -589,6 +3319,8 @@ class JTReadFromExcel:
     Notes:
         - Automatically handles Excel file extension (.xlsx)
         - Creates directory if not exists
+        - Sheet values are kept in a shared cache (see _SheetCache); the sheet is
+          streamed in read-only mode and parsing stops at the target row
     """
     
     @classmethod
@@ -626,6 +3358,21 @@ class JTReadFromExcel:
                     "round": True
                 })
             },
+            "optional": {
+                "Sheet_Name": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "label": "Sheet_Name (empty = active sheet)"
+                }),
+                "Backend": (TABLE_BACKENDS, {
+                    "default": "xlsx",
+                    "label": "Backend"
+                }),
+                "Content_Hash": ("BOOLEAN", {
+                    "default": False,
+                    "label": "Detect changes by content hash"
+                }),
+            },
         }
     
     RETURN_TYPES = ("STRING", "INT", "INT")
@@ -633,7 +3380,14 @@ class JTReadFromExcel:
     FUNCTION = "read_from_excel"
     CATEGORY = "JT/text"
 
-    def read_from_excel(self, Excel_Filepath: str, Excel_Filename: str, Row_Number: int, Column_Number: int) -> tuple[str, int, int]:
+    @classmethod
+    def IS_CHANGED(cls, Excel_Filepath: str = None, Excel_Filename: str = None, Backend: str = "xlsx",
+                   Content_Hash: bool = False, **kwargs):
+        # Re-run only when the table file changed (path, mtime, size, optional content hash)
+        return _table_fingerprint(Excel_Filepath, Excel_Filename, Backend, Content_Hash)
+
+    def read_from_excel(self, Excel_Filepath: str, Excel_Filename: str, Row_Number: int, Column_Number: int,
+                        Sheet_Name: str = "", Backend: str = "xlsx", Content_Hash: bool = False) -> tuple[str, int, int]:
         """Read text from specified position in Excel file
         
         Args:
@@ -641,6 +3395,9 @@ class JTReadFromExcel:
             Excel_Filename: Excel file name
             Row_Number: Row number to read from
             Column_Number: Column number to read from
+            Sheet_Name: Sheet to read, empty for the active sheet
+            Backend: xlsx, or sqlite to read the table written with backend="sqlite"
+            Content_Hash: Also hash the file content in IS_CHANGED
             
         Returns:
             tuple: (cell text, row number, column number)
@@ -657,46 +3414,356 @@ class JTReadFromExcel:
                 
             # Full file path
             file_path = file_dir / Excel_Filename
+
+            if Backend == "sqlite":
+                # SQLite table: indexed query (validates position)
+                value = _SqliteTable.cell_value(_SqliteTable.path_for(file_dir, Excel_Filename),
+                                                Sheet_Name or None, Row_Number, Column_Number)
+            else:
+                # Save pending write-behind cells first
+                _WorkbookCache.flush(file_path)
+                # Get cell value from shared sheet cache (validates position)
+                value = _SheetCache.cell_value(file_path, Sheet_Name or None, Row_Number, Column_Number)
+            cell_text = str(value) if value is not None else ""
             
-            # Load Excel file
-            wb = openpyxl.load_workbook(file_path, data_only=True)
-            ws = wb.active
-            
-            # Check if position is valid
-            if Row_Number > ws.max_row:
-                raise ValueError(f"Row number {Row_Number} exceeds maximum row {ws.max_row}")
-            if Column_Number > ws.max_column:
-                raise ValueError(f"Column number {Column_Number} exceeds maximum column {ws.max_column}")
-            
-            # Get cell value
-            cell = ws.cell(row=Row_Number, column=Column_Number)
-            cell_text = str(cell.value) if cell.value is not None else ""
-            
-            wb.close()
             return (cell_text, Row_Number, Column_Number)
             
         except Exception as e:
             raise RuntimeError(f"Error reading Excel file: {str(e)}")
 
+class _ExcelRowStream:
+    """
+    Open read-only row iterators over Excel sheets, kept per (path, sheet).
+
+    Consecutive reads continue from the same iterator, so walking through a sheet
+    a few rows per execution parses the file once. The iterator is reopened (and
+    the rows before the cursor skipped) when the file changes, after a restart or
+    when the cursor was moved, and closed when it reaches the end of the sheet.
+    """
+
+    MAX_STREAMS = 4
+
+    _streams = OrderedDict()  # (绝对路径, 工作表) -> 行迭代器
+    _lock = threading.Lock()
+
+    def __init__(self, file_path: Path, sheet_name: str, state, start_row: int):
+        self.state = state
+        self.next_row = start_row
+        self.wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            self.rows = _open_sheet(self.wb, sheet_name).iter_rows(min_row=start_row, values_only=True)
+        except Exception:
+            self.wb.close()
+            raise
+
+    def close(self):
+        self.wb.close()
+
+    @classmethod
+    def read(cls, file_path: Path, sheet_name: str, start_row: int, count: int) -> tuple[list, bool]:
+        """读取从start_row开始的count行，返回 ([(行号, 值元组)], 是否已到工作表末尾)"""
+        key = (os.path.abspath(file_path), sheet_name)
+        state = _file_state(file_path)
+        if state is None:
+            raise FileNotFoundError(f"No such file: '{file_path}'")
+        with cls._lock:
+            stream = cls._streams.pop(key, None)
+            if stream is not None and (stream.state != state or stream.next_row != start_row):
+                stream.close()
+                stream = None
+            if stream is None:
+                stream = cls(file_path, sheet_name, state, start_row)
+
+            rows = []
+            for values in itertools.islice(stream.rows, count):
+                rows.append((stream.next_row, values))
+                stream.next_row += 1
+            finished = len(rows) < count
+            if finished:
+                stream.close()
+            else:
+                cls._streams[key] = stream
+                while len(cls._streams) > cls.MAX_STREAMS:
+                    cls._streams.popitem(last=False)[1].close()
+            return rows, finished
+
+class JTExcelRowIterator:
+    """Excel逐行迭代节点，每次执行输出游标处的下一行（或下K行）并前移游标
+
+    Attributes:
+        RETURN_TYPES (tuple): 定义输出类型
+        FUNCTION (str): 处理函数名
+        CATEGORY (str): 节点分类
+
+    Notes:
+        - 工作表以只读流式模式打开并在进程内保持，连续执行时从上次的位置继续读取，
+          遍历整个表格只解析一次文件
+        - 游标保存在表格所在目录的 .jt_excel_cursors.json 中，重启ComfyUI后继续
+        - Cursor_Name 区分同一表格的多个独立游标
+        - 到达表格末尾后输出空列表（finished为True），开启Loop时从Start_Row重新开始
+        - 每次执行都会前移游标，因此总是重新执行
+    """
+
+    CURSOR_FILE = ".jt_excel_cursors.json"
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "Excel_Filepath": ("STRING", {
+                    "default": "/path",
+                    "multiline": False,
+                    "label": "Excel_Filepath",
+                    "paste": True
+                }),
+                "Excel_Filename": ("STRING", {
+                    "default": "table",
+                    "multiline": False,
+                    "label": "Excel_Filename",
+                    "paste": True
+                }),
+                "Rows_Per_Run": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 10000,
+                    "step": 1,
+                    "label": "Rows_Per_Run"
+                }),
+                "Column_Number": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 16384,  # Excel max column number
+                    "step": 1,
+                    "label": "Column_Number (0 = whole row, tab separated)"
+                }),
+                "Start_Row": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 1048576,  # Excel max row number
+                    "step": 1,
+                    "label": "Start_Row"
+                }),
+                "Reset": ("BOOLEAN", {
+                    "default": False,
+                    "label": "Reset cursor to Start_Row"
+                }),
+            },
+            "optional": {
+                "Sheet_Name": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "label": "Sheet_Name (empty = active sheet)"
+                }),
+                "Cursor_Name": ("STRING", {
+                    "default": "default",
+                    "multiline": False,
+                    "label": "Cursor_Name"
+                }),
+                "Loop": ("BOOLEAN", {
+                    "default": False,
+                    "label": "Restart from Start_Row at the end"
+                }),
+                "Backend": (TABLE_BACKENDS, {
+                    "default": "xlsx",
+                    "label": "Backend"
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "INT", "INT", "BOOLEAN")
+    RETURN_NAMES = ("row_text", "row_number", "next_row", "finished")
+    OUTPUT_IS_LIST = (True, True, False, False)
+    FUNCTION = "next_rows"
+    CATEGORY = "JT/text"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return float("nan")
+
+    def _load_cursors(self, cursor_path: Path) -> dict:
+        try:
+            return json.loads(cursor_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cursors(self, cursor_path: Path, cursors: dict):
+        # 先写临时文件再替换，避免中断时游标文件损坏
+        tmp_path = cursor_path.with_name(f"{cursor_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(cursors, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, cursor_path)
+
+    def _read_rows(self, file_dir: Path, filename: str, sheet_name: str, start_row: int,
+                   count: int, backend: str) -> tuple[list, bool]:
+        if backend == "sqlite":
+            return _SqliteTable.read_rows(_SqliteTable.path_for(file_dir, filename), sheet_name, start_row, count)
+        file_path = file_dir / filename
+        _WorkbookCache.flush(file_path)
+        return _ExcelRowStream.read(file_path, sheet_name, start_row, count)
+
+    def next_rows(self, Excel_Filepath: str, Excel_Filename: str, Rows_Per_Run: int, Column_Number: int,
+                  Start_Row: int, Reset: bool, Sheet_Name: str = "", Cursor_Name: str = "default",
+                  Loop: bool = False, Backend: str = "xlsx") -> tuple[list, list, int, bool]:
+        """输出游标处的下Rows_Per_Run行并前移游标
+
+        Args:
+            Excel_Filepath: Excel文件目录
+            Excel_Filename: Excel文件名
+            Rows_Per_Run: 每次执行输出的行数
+            Column_Number: 输出的列号，0时输出整行（Tab分隔）
+            Start_Row: 游标的起始行号
+            Reset: 是否将游标重置到Start_Row
+            Sheet_Name: 工作表名，为空时使用活动工作表
+            Cursor_Name: 游标名称
+            Loop: 到达末尾后是否从Start_Row重新开始
+            Backend: xlsx或sqlite
+
+        Returns:
+            tuple: (行文本列表, 行号列表, 下一次执行的起始行号, 是否已到表格末尾)
+        """
+        try:
+            file_dir = Path(Excel_Filepath)
+            file_dir.mkdir(parents=True, exist_ok=True)
+            if not any(Excel_Filename.endswith(ext) for ext in ['.xlsx', '.xls']):
+                Excel_Filename = f"{Excel_Filename}.xlsx"
+            sheet_name = Sheet_Name or None
+
+            with self._lock:
+                cursor_path = file_dir / self.CURSOR_FILE
+                cursors = self._load_cursors(cursor_path)
+                cursor_key = f"{Excel_Filename}|{Sheet_Name}|{Cursor_Name}|{Backend}"
+                start_row = Start_Row if Reset else cursors.get(cursor_key, Start_Row)
+
+                rows, finished = self._read_rows(file_dir, Excel_Filename, sheet_name,
+                                                 start_row, Rows_Per_Run, Backend)
+                if not rows and Loop and start_row != Start_Row:
+                    start_row = Start_Row
+                    rows, finished = self._read_rows(file_dir, Excel_Filename, sheet_name,
+                                                     start_row, Rows_Per_Run, Backend)
+                next_row = start_row + len(rows)
+                if finished and Loop:
+                    next_row = Start_Row
+                cursors[cursor_key] = next_row
+                self._save_cursors(cursor_path, cursors)
+        except Exception as e:
+            raise RuntimeError(f"Error iterating Excel file: {str(e)}")
+
+        texts = []
+        for _, values in rows:
+            if Column_Number:
+                value = values[Column_Number - 1] if Column_Number <= len(values) else None
+                texts.append(str(value) if value is not None else "")
+            else:
+                # 去掉行尾的空单元格
+                end = len(values)
+                while end and values[end - 1] is None:
+                    end -= 1
+                texts.append("\t".join(str(value) if value is not None else "" for value in values[:end]))
+        return (texts, [row for row, _ in rows], next_row, finished)
+
+class JTExportTableToExcel:
+    """SQLite表格导出节点，将 backend="sqlite" 保存的表格一次性导出为xlsx文件
+
+    Attributes:
+        RETURN_TYPES (tuple): 定义输出类型
+        FUNCTION (str): 处理函数名
+        CATEGORY (str): 节点分类
+
+    Notes:
+        - 读取 <filename>.sqlite，按工作表写入的先后顺序导出到 <filename>.xlsx
+        - 使用write_only模式逐行写出，导出过程中不在内存中构建单元格对象
+        - 先写入临时文件再替换，读取节点不会读到不完整的文件
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "folder_path": ("STRING", {
+                    "default": "/path",
+                    "multiline": False
+                }),
+                "filename": ("STRING", {
+                    "default": "output",
+                    "multiline": False
+                }),
+            },
+            "optional": {
+                "text": ("STRING", {
+                    "forceInput": True
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING", "INT")
+    RETURN_NAMES = ("text", "xlsx_path", "cell_count")
+    FUNCTION = "export_table"
+    CATEGORY = "JT/text"
+    OUTPUT_NODE = True
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return float("nan")
+
+    def export_table(self, folder_path: str, filename: str, text: str = "") -> tuple[str, str, int]:
+        """导出SQLite表格为xlsx
+
+        Args:
+            folder_path: 表格所在目录
+            filename: 文件名(可带.xlsx扩展名)
+            text: 透传的文本，连接保存节点的输出以保证执行顺序
+
+        Returns:
+            tuple: (透传的文本, xlsx文件路径, 导出的单元格数)
+        """
+        try:
+            db_path = _SqliteTable.path_for(folder_path, filename)
+            if not db_path.exists():
+                raise FileNotFoundError(f"No such file: '{db_path}'")
+            xlsx_path = db_path.with_suffix(".xlsx")
+            count = _SqliteTable.export_xlsx(db_path, xlsx_path)
+        except Exception as e:
+            raise RuntimeError(f"导出Excel文件时出错: {str(e)}")
+        return (text, str(xlsx_path), count)
+
 # Node registration mappings
 NODE_CLASS_MAPPINGS = {
     "JT Find Text From Excel": JTFindTextFromExcel,
     "JT Read From Excel": JTReadFromExcel,
+    "JTExcelCacheStats": JTExcelCacheStats,
+    "JTExcelRowIterator": JTExcelRowIterator,
     "JTBrightness": JTBrightnessNode,
+    "JTColorAdjust": JTColorAdjustNode,
     "JTImagesavetopath": JTImagesavetopath,
+    "JTFlushImageSaves": JTFlushImageSaves,
     "JTcounter": JTcounter,
     "SiliconflowFree": SiliconflowFreeNode,
+    "SiliconflowBatch": SiliconflowBatchNode,
     "JTSaveTextToFile": JTSaveTextToFile,
-    "JTSaveTextToExcel": JTSaveTextToExcel
+    "JTSaveTextRecord": JTSaveTextRecord,
+    "JTSaveTextToExcel": JTSaveTextToExcel,
+    "JTSaveTableToExcel": JTSaveTableToExcel,
+    "JTFlushExcelWrites": JTFlushExcelWrites,
+    "JTExportTableToExcel": JTExportTableToExcel
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "JT Find Text From Excel": "JT Find Text From Excel",
     "JT Read From Excel": "JT Read From Excel",
+    "JTExcelCacheStats": "JT Excel Cache Stats",
+    "JTExcelRowIterator": "JT Excel Row Iterator",
     "JTBrightness": "JT Brightness Adjustment",
+    "JTColorAdjust": "JT Color Adjustment",
     "JTImagesavetopath": "JT Save Image to Path",
+    "JTFlushImageSaves": "JT Flush Image Saves",
     "JTcounter": "JT Serial Counter",
     "SiliconflowFree": "JT Siliconflow LLM",
+    "SiliconflowBatch": "JT Siliconflow LLM Batch",
     "JTSaveTextToFile": "JT Save Text to File",
-    "JTSaveTextToExcel": "JT Save Text to Excel"
+    "JTSaveTextRecord": "JT Save Text Record",
+    "JTSaveTextToExcel": "JT Save Text to Excel",
+    "JTSaveTableToExcel": "JT Save Table to Excel",
+    "JTFlushExcelWrites": "JT Flush Excel Writes",
+    "JTExportTableToExcel": "JT Export Table to Excel"
 }